@@ -0,0 +1,75 @@
+from typing import Any, Callable
+
+import pygame
+
+from atlas import SpriteAtlas, load_atlas
+from utils import load_sprite, load_sprite_sheet
+
+
+class AssetCache:
+    def __init__(self):
+        self._assets = {}
+        self._quit_registered = False
+
+    def _get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        if key in self._assets:
+            return self._assets[key]
+
+        asset = loader()
+        self._assets[key] = asset
+        if not self._quit_registered:
+            pygame.register_quit(self._on_quit)
+            self._quit_registered = True
+        return asset
+
+    def _on_quit(self) -> None:
+        self.clear()
+        self._quit_registered = False
+
+    def sound(self, path: str) -> pygame.mixer.Sound:
+        return self._get(('sound', path), lambda: pygame.mixer.Sound(path))
+
+    def sprite(self, path: str, size: int) -> pygame.Surface:
+        return self._get(('sprite', path, size), lambda: load_sprite(path, size))
+
+    def sprite_sheet(self, path: str, frame_width: int, frame_height: int) -> list[pygame.Surface]:
+        return self._get(('sprite_sheet', path, frame_width, frame_height),
+                         lambda: load_sprite_sheet(path, frame_width, frame_height))
+
+    def atlas(self, cell_size: int) -> SpriteAtlas:
+        return self._get(('atlas', cell_size), lambda: load_atlas(cell_size))
+
+    def image(self, path: str, size: tuple[int, int]) -> pygame.Surface:
+        return self._get(('image', path, size),
+                         lambda: pygame.transform.scale(pygame.image.load(path).convert(), size))
+
+    def font(self, path: str, size: int) -> pygame.font.Font:
+        return self._get(('font', path, size), lambda: pygame.font.Font(path, size))
+
+    def preload(self,
+                sounds: tuple[str, ...] = (),
+                sprites: tuple[tuple[str, int], ...] = (),
+                fonts: tuple[tuple[str, int], ...] = ()
+                ) -> None:
+        for path in sounds:
+            self.sound(path)
+        for path, size in sprites:
+            self.sprite(path, size)
+        for path, size in fonts:
+            self.font(path, size)
+
+    def evict(self, path: str) -> None:
+        for key in [key for key in self._assets if key[1] == path]:
+            del self._assets[key]
+
+    def clear(self) -> None:
+        self._assets.clear()
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._assets
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+
+asset_cache = AssetCache()
@@ -0,0 +1,109 @@
+import json
+import math
+import os
+
+import pygame
+
+from utils import load_sprite, load_sprite_sheet
+
+VERSION = 1
+TILE_SIZE = 48
+TILE_SHEET = 'assets/tiles.png'
+SPRITES = {
+    'player': 'assets/astronaut.png',
+    'robot': 'assets/robot1.png',
+    'key': 'assets/key.png',
+    'charge': 'assets/charge.png',
+}
+DEFAULT_CACHE_DIR = os.path.join('.cache', 'atlas')
+
+
+class SpriteAtlas:
+    def __init__(self, surface: pygame.Surface, regions: dict[str, pygame.Rect]):
+        self.surface = surface
+        self.regions = regions
+        self.tiles = [surface.subsurface(rect) for name, rect in regions.items() if name.startswith('tile')]
+        self.sprites = {name: surface.subsurface(regions[name]) for name in regions if not name.startswith('tile')}
+
+    @classmethod
+    def build(cls,
+              cell_size: int,
+              tile_sheet: str = TILE_SHEET,
+              sprites: dict[str, str] = SPRITES
+              ) -> 'SpriteAtlas':
+        images = {f"tile{index}": tile if cell_size == TILE_SIZE else pygame.transform.scale(tile, (cell_size, cell_size))
+                  for index, tile in enumerate(load_sprite_sheet(tile_sheet, TILE_SIZE, TILE_SIZE))}
+        images.update((name, load_sprite(path, cell_size)) for name, path in sprites.items())
+
+        columns = math.ceil(math.sqrt(len(images)))
+        rows = -(-len(images) // columns)
+        surface = pygame.Surface((columns * cell_size, rows * cell_size), pygame.SRCALPHA).convert_alpha()
+        surface.fill((0, 0, 0, 0))
+
+        regions = {}
+        for index, (name, image) in enumerate(images.items()):
+            rect = pygame.Rect(index % columns * cell_size, index // columns * cell_size, cell_size, cell_size)
+            surface.blit(image, rect, special_flags=pygame.BLEND_RGBA_MAX)
+            regions[name] = rect
+        return cls(surface, regions)
+
+    @classmethod
+    def from_cache(cls, meta_path: str, pixels_path: str, key: dict) -> 'SpriteAtlas | None':
+        try:
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if meta['key'] != key:
+                return None
+            with open(pixels_path, 'rb') as f:
+                pixels = f.read()
+            surface = pygame.image.frombytes(pixels, tuple(meta['size']), 'RGBA').convert_alpha()
+        except (OSError, ValueError, KeyError):
+            return None
+        return cls(surface, {name: pygame.Rect(rect) for name, rect in meta['regions'].items()})
+
+    def save(self, meta_path: str, pixels_path: str, key: dict) -> None:
+        os.makedirs(os.path.dirname(meta_path) or '.', exist_ok=True)
+        write_atomic(pixels_path, pygame.image.tobytes(self.surface, 'RGBA'))
+        meta = {
+            'key': key,
+            'size': list(self.surface.get_size()),
+            'regions': {name: list(rect) for name, rect in self.regions.items()},
+        }
+        write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+
+
+def source_key(cell_size: int, paths: list[str]) -> dict:
+    sources = {}
+    for path in paths:
+        stat = os.stat(path)
+        sources[path] = [stat.st_mtime_ns, stat.st_size]
+    return {'version': VERSION, 'cell_size': cell_size, 'sources': sources}
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def load_atlas(cell_size: int,
+               cache_dir: str | None = None,
+               tile_sheet: str = TILE_SHEET,
+               sprites: dict[str, str] = SPRITES
+               ) -> SpriteAtlas:
+    cache_dir = cache_dir or os.environ.get('ROBOTBATTLE_ASSET_CACHE', DEFAULT_CACHE_DIR)
+    meta_path = os.path.join(cache_dir, f"atlas-{cell_size}.json")
+    pixels_path = os.path.join(cache_dir, f"atlas-{cell_size}.rgba")
+    key = source_key(cell_size, [tile_sheet, *sprites.values()])
+
+    atlas = SpriteAtlas.from_cache(meta_path, pixels_path, key)
+    if atlas is not None:
+        return atlas
+
+    atlas = SpriteAtlas.build(cell_size, tile_sheet, sprites)
+    try:
+        atlas.save(meta_path, pixels_path, key)
+    except OSError as e:
+        print(f"Error caching sprite atlas: {e}")
+    return atlas
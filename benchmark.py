@@ -0,0 +1,249 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
+
+import game_core_ext
+import game_over_screen_ext
+import map_generator_ext
+import robot_core_ext
+
+from atlas import SpriteAtlas
+from engine import Action, GameEngine
+from game_config import GameConfig
+from game_renderer import GameRenderer
+
+DEFAULT_SIZES = ['11x18', '22x36', '44x72']
+DEFAULT_DIFFICULTIES = ['easy', 'normal', 'hard']
+MAX_SCREEN_SIDE = 1600
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    rows, cols = size.lower().split('x')
+    return int(rows), int(cols)
+
+
+def make_config(difficulty: str, rows: int, cols: int, viewport: tuple[int, int] | None = None) -> GameConfig:
+    config = GameConfig.load(difficulty)
+    view_rows, view_cols = viewport or (rows, cols)
+    view_rows, view_cols = min(view_rows, rows), min(view_cols, cols)
+    cell_size = max(8, min(config.cell_size, MAX_SCREEN_SIDE // max(view_rows, view_cols)))
+    return config.replace(
+        grid={
+            "rows": rows,
+            "cols": cols,
+            "cell_size": cell_size,
+            "viewport_rows": view_rows,
+            "viewport_cols": view_cols,
+            "screen_width": view_cols * cell_size,
+            "screen_height": view_rows * cell_size,
+        },
+        gameplay={
+            "player_start_position": [rows // 2, cols - 1],
+            "exit_position": [rows // 2, 0],
+        },
+    )
+
+
+def measure(func: Callable[[], object], repeat: int, number: int = 1) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+
+
+def random_policy(rng: random.Random) -> Callable[[GameEngine], Action]:
+    def policy(engine: GameEngine) -> Action:
+        cells = engine.get_movable_cells() or [engine.player.position()]
+        row, col = rng.choice(cells)
+        return 'move', row, col
+    return policy
+
+
+def bench_engine(config: GameConfig, repeat: int, seed: int) -> dict:
+    engine = GameEngine(config, seed=seed)
+    cfg_data = engine.cfg_data
+    results = {}
+
+    results["generate_map"] = measure(lambda: map_generator_ext.generate_map(cfg_data, seed), repeat, number=20)
+
+    game_map = map_generator_ext.generate_map(cfg_data, seed)
+    codes = [config.cell_codes[name] for name in ('robot', 'charge', 'key', 'player')]
+    results["convert_map"] = measure(lambda: game_core_ext.convert_map(game_map, *codes), repeat, number=20)
+
+    robots = list(engine.robots.values())
+    player_x, player_y = engine.player.position()
+    results["update_robots"] = measure(
+        lambda: robot_core_ext.update_robots(robots, player_x, player_y, engine.hazards, engine.robot_ai),
+        repeat, number=20)
+
+    turns = []
+
+    def play_game():
+        engine.reset(seed)
+        engine.play(random_policy(random.Random(seed)), max_turns=200)
+        turns.append(engine.turn)
+
+    results["play_turn"] = measure(play_game, repeat)
+    turn_count = max(statistics.median(turns), 1)
+    for key in ("median_ms", "min_ms", "max_ms"):
+        results["play_turn"][key] /= turn_count
+    results["play_turn"]["turns"] = turn_count
+    results["robots"] = len(robots)
+    return results
+
+
+def bench_display(config: GameConfig, repeat: int, seed: int) -> dict:
+    cell_size = config.cell_size
+    screen = pygame.display.set_mode(config.screen_size)
+
+    engine = GameEngine(config, seed=seed)
+    atlas = SpriteAtlas.build(cell_size)
+    player_sprite, robot_sprite, key_sprite, charge_sprite = (atlas.sprites[name]
+                                                              for name in ('player', 'robot', 'key', 'charge'))
+    renderer = GameRenderer(screen, atlas.tiles,
+                            player_sprite, robot_sprite, key_sprite, charge_sprite, config)
+
+    highlight = engine.get_movable_cells()
+    scene = (engine.map, engine.keys, engine.charges, engine.player, engine.robot_cells, engine.pinged, highlight)
+
+    def full_render():
+        renderer.invalidate()
+        renderer.render(*scene)
+
+    results = {"render_full": measure(full_render, repeat)}
+
+    robot_ids = set(engine.robots)
+
+    def incremental_render():
+        engine.pinged.symmetric_difference_update(robot_ids)
+        renderer.render(*scene)
+
+    renderer.render(*scene)
+    results["render_incremental"] = measure(incremental_render, repeat, number=5)
+
+    captured = screen.copy()
+
+    def blur():
+        pixels = pygame.surfarray.pixels3d(captured)
+        game_over_screen_ext.apply_gaussian_blur(pixels, sigma=2)
+        del pixels
+
+    results["blur"] = measure(blur, repeat)
+    return results
+
+
+def run(sizes: list[str],
+        difficulties: list[str],
+        repeat: int,
+        seed: int,
+        display: bool = True,
+        viewport: tuple[int, int] | None = None
+        ) -> dict:
+    pygame.init()
+    results = {}
+    try:
+        for size in sizes:
+            rows, cols = parse_size(size)
+            for difficulty in difficulties:
+                config = make_config(difficulty, rows, cols, viewport)
+                case = bench_engine(config, repeat, seed)
+                if display:
+                    case.update(bench_display(config, repeat, seed))
+                results[f"{difficulty}/{rows}x{cols}"] = case
+    finally:
+        pygame.quit()
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pygame": pygame.version.ver,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for case, timings in baseline["results"].items():
+        for name, timing in timings.items():
+            if not isinstance(timing, dict):
+                continue
+            measured = current["results"].get(case, {}).get(name)
+            if measured is None:
+                continue
+            limit = timing["median_ms"] * (1 + tolerance)
+            if measured["median_ms"] > limit:
+                regressions.append(f"{case} {name}: {measured['median_ms']:.3f} ms "
+                                   f"(baseline {timing['median_ms']:.3f} ms, limit {limit:.3f} ms)")
+    return regressions
+
+
+def print_results(report: dict) -> None:
+    for case, timings in report["results"].items():
+        print(case)
+        for name, timing in timings.items():
+            if isinstance(timing, dict):
+                print(f"  {name:<20}{timing['median_ms']:>10.3f} ms  (min {timing['min_ms']:.3f})")
+            else:
+                print(f"  {name:<20}{timing:>10}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark map generation, turn resolution, blur and rendering.")
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="comma separated ROWSxCOLS grid sizes")
+    parser.add_argument('--difficulties', default=','.join(DEFAULT_DIFFICULTIES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-display', action='store_true', help="skip renderer and blur benchmarks")
+    parser.add_argument('--viewport', help="ROWSxCOLS camera viewport for large maps")
+    parser.add_argument('--output', help="write results as JSON to this path")
+    parser.add_argument('--baseline', help="fail if any median is slower than this JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes.split(','), args.difficulties.split(','), args.repeat, args.seed,
+                 display=not args.no_display, viewport=parse_size(args.viewport) if args.viewport else None)
+    print_results(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
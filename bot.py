@@ -0,0 +1,266 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
+
+import player_core_ext
+
+from engine import HAZARD_CLEFT, Action, GameEngine
+from game_config import GameConfig
+
+
+class Node:
+    __slots__ = ('children', 'untried', 'visits', 'value')
+
+    def __init__(self, actions: list[Action]):
+        self.children = {}
+        self.untried = actions
+        self.visits = 0
+        self.value = 0.0
+
+
+def is_fatal(engine: GameEngine, row: int, col: int) -> bool:
+    if engine.hazards[row, col] & HAZARD_CLEFT:
+        return True
+    robot_id = engine.robot_cells.get((row, col))
+    return robot_id is not None and robot_id not in engine.pinged
+
+
+def threat(engine: GameEngine, row: int, col: int) -> int:
+    return sum(1 for cell in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+               if cell in engine.robot_cells and engine.robot_cells[cell] not in engine.pinged)
+
+
+class Distances:
+    def __init__(self):
+        self.fields = {}
+
+    def field(self, engine: GameEngine, goal: tuple[int, int]) -> list[list[int]]:
+        field = self.fields.get(goal)
+        if field is None:
+            field = self.fields[goal] = player_core_ext.distance_field(goal[0], goal[1], engine.hazards).tolist()
+        return field
+
+    def target(self, engine: GameEngine) -> tuple[int, int]:
+        if engine.player.keys >= engine.number_of_keys or not engine.keys:
+            return engine.exit_pos
+        x, y = engine.player.position()
+        return min(sorted(engine.keys), key=lambda key: self.distance(engine, key, x, y))
+
+    def distance(self, engine: GameEngine, goal: tuple[int, int], row: int, col: int) -> int:
+        distance = self.field(engine, goal)[row][col]
+        return distance if distance >= 0 else engine.map.shape[0] + engine.map.shape[1]
+
+
+def candidate_actions(engine: GameEngine) -> list[Action]:
+    legal = engine.legal_actions()
+    actions = []
+    for action, row, col in legal:
+        if action == 'ping':
+            if engine.robot_cells[(row, col)] not in engine.pinged:
+                actions.append((action, row, col))
+        elif not is_fatal(engine, row, col):
+            actions.append((action, row, col))
+    return actions or [action for action in legal if action[0] == 'move']
+
+
+def rollout_action(engine: GameEngine, distances: Distances, rng: random.Random, greed: float = 0.8) -> Action:
+    moves = [(row, col) for row, col in engine.get_movable_cells() if not is_fatal(engine, row, col)]
+    safe = [cell for cell in moves if not threat(engine, *cell)] or moves
+    if not safe:
+        row, col = engine.player.position()
+        return 'move', row, col
+
+    if rng.random() < greed:
+        goal = distances.target(engine)
+        field = distances.field(engine, goal)
+        best = min(field[row][col] for row, col in safe)
+        safe = [(row, col) for row, col in safe if field[row][col] == best]
+    row, col = rng.choice(safe)
+    return 'move', row, col
+
+
+def evaluate(engine: GameEngine, distances: Distances) -> float:
+    if engine.outcome == 'win':
+        return 1.0
+    if engine.outcome is not None:
+        return 0.0
+
+    rows, cols = engine.map.shape
+    distance = distances.distance(engine, distances.target(engine), engine.player.x, engine.player.y)
+    keys = min(engine.player.keys, engine.number_of_keys) / engine.number_of_keys
+    return 0.1 + 0.6 * keys + 0.2 * (1 - distance / (rows + cols))
+
+
+def rollout(engine: GameEngine, distances: Distances, rng: random.Random, depth: int) -> float:
+    for _ in range(depth):
+        if engine.outcome is not None:
+            break
+        engine.apply(*rollout_action(engine, distances, rng))
+    return evaluate(engine, distances)
+
+
+def search(engine: GameEngine,
+           iterations: int | None = 200,
+           time_budget: float | None = None,
+           rng: random.Random | None = None,
+           rollout_depth: int = 12,
+           exploration: float = 1.4
+           ) -> dict[Action, int]:
+    if iterations is None and time_budget is None:
+        raise ValueError("Search needs an iteration or time budget")
+
+    rng = rng or random.Random()
+    distances = Distances()
+    root = Node(candidate_actions(engine))
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+
+    iteration = 0
+    while (iterations is None or iteration < iterations) and (deadline is None or time.perf_counter() < deadline):
+        iteration += 1
+        simulation = engine.clone()
+        node = root
+        path = [root]
+
+        while not node.untried and node.children and simulation.outcome is None:
+            log_visits = math.log(node.visits)
+            action, node = max(node.children.items(),
+                               key=lambda item: item[1].value / item[1].visits
+                               + exploration * math.sqrt(log_visits / item[1].visits))
+            simulation.apply(*action)
+            path.append(node)
+
+        if node.untried and simulation.outcome is None:
+            action = node.untried.pop(rng.randrange(len(node.untried)))
+            simulation.apply(*action)
+            child = Node(candidate_actions(simulation))
+            node.children[action] = child
+            path.append(child)
+
+        reward = rollout(simulation, distances, rng, rollout_depth)
+        for visited in path:
+            visited.visits += 1
+            visited.value += reward
+
+    return {action: child.visits for action, child in root.children.items()}
+
+
+def _search_task(game_config: GameConfig, state: dict, iterations: int | None, time_budget: float | None,
+                 seed: int, rollout_depth: int, exploration: float) -> dict[Action, int]:
+    engine = GameEngine(game_config)
+    engine.restore(state)
+    return search(engine, iterations, time_budget, random.Random(seed), rollout_depth, exploration)
+
+
+class MCTSBot:
+    def __init__(self,
+                 iterations: int | None = 200,
+                 time_budget: float | None = None,
+                 workers: int = 1,
+                 rollout_depth: int = 12,
+                 exploration: float = 1.4,
+                 seed: int | None = None):
+        self.iterations = iterations
+        self.time_budget = time_budget
+        self.workers = workers
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.executor = ProcessPoolExecutor(workers) if workers > 1 else None
+
+    def __call__(self, engine: GameEngine) -> Action:
+        actions = candidate_actions(engine)
+        if len(actions) == 1:
+            return actions[0]
+
+        if self.executor is None:
+            visits = search(engine, self.iterations, self.time_budget, self.rng, self.rollout_depth, self.exploration)
+        else:
+            iterations = -(-self.iterations // self.workers) if self.iterations is not None else None
+            state = engine.state()
+            futures = [self.executor.submit(_search_task, engine.game_config, state, iterations, self.time_budget,
+                                            self.rng.getrandbits(64), self.rollout_depth, self.exploration)
+                       for _ in range(self.workers)]
+            visits = Counter()
+            for future in futures:
+                visits.update(future.result())
+
+        return max(visits, key=visits.get) if visits else actions[0]
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def __enter__(self) -> 'MCTSBot':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def play_game(game_config: GameConfig, seed: int, max_turns: int = 300, **bot_options) -> dict:
+    engine = GameEngine(game_config, seed=seed)
+    reachable = player_core_ext.distance_field(engine.player.x, engine.player.y, engine.hazards)
+    keys_reachable = sum(1 for key in engine.keys if reachable[key] >= 0)
+    with MCTSBot(seed=seed, **bot_options) as bot:
+        outcome = engine.play(bot, max_turns=max_turns)
+    return {
+        'seed': engine.seed,
+        'outcome': outcome or 'timeout',
+        'turns': engine.turn,
+        'keys_reachable': keys_reachable,
+    }
+
+
+def soak(game_config: GameConfig, games: int, workers: int = 1, seed: int = 0, **options) -> list[dict]:
+    seeds = [seed + index for index in range(games)]
+    if workers <= 1:
+        return [play_game(game_config, game_seed, **options) for game_seed in seeds]
+    with ProcessPoolExecutor(workers) as executor:
+        futures = [executor.submit(play_game, game_config, game_seed, **options) for game_seed in seeds]
+        return [future.result() for future in futures]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Play Robot Battle with a Monte Carlo tree search bot.")
+    parser.add_argument('--difficulty', default='normal')
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--workers', type=int, default=1, help="processes running games in parallel")
+    parser.add_argument('--iterations', type=int, default=200, help="search iterations per move")
+    parser.add_argument('--time-budget', type=float, help="seconds of search per move")
+    parser.add_argument('--max-turns', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--watch', action='store_true', help="play one game on screen")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        from game import Game
+
+        bot = MCTSBot(args.iterations, args.time_budget, workers=args.workers, seed=args.seed)
+        Game(bot=bot, difficulty=args.difficulty).run()
+        return 0
+
+    game_config = GameConfig(difficulty=args.difficulty)
+    results = soak(game_config, args.games, args.workers, args.seed, max_turns=args.max_turns,
+                   iterations=args.iterations, time_budget=args.time_budget)
+
+    outcomes = Counter(result['outcome'] for result in results)
+    print(f"{args.games} games on {args.difficulty}: " + ", ".join(f"{name} {count}" for name, count in outcomes.items()))
+    print(f"average turns: {sum(result['turns'] for result in results) / len(results):.1f}")
+    for result in results:
+        if result['keys_reachable'] < game_config.get_gameplay_settings()["number_of_keys"]:
+            print(f"unwinnable map seed {result['seed']}: only {result['keys_reachable']} reachable keys")
+        elif result['outcome'] != 'win' and result['turns'] <= 2:
+            print(f"instant loss map seed {result['seed']}: {result['outcome']} on turn {result['turns']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
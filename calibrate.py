@@ -0,0 +1,161 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from bot import Distances, rollout_action
+from engine import Action, GameEngine
+from game_config import GameConfig
+
+TUNABLE = {
+    'clefts_coefficient': float,
+    'initial_robots_coefficient': float,
+    'charges_coefficient': float,
+    'max_charges': int,
+    'robot_ai': str,
+}
+OUTCOMES = ('win', 'robot', 'cleft', 'timeout')
+Z_95 = 1.96
+
+
+def parse_sweep(specs: list[str]) -> dict[str, list]:
+    sweep = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in TUNABLE:
+            raise ValueError(f"'{name}' is not a tunable difficulty setting; choose from {', '.join(TUNABLE)}")
+        sweep[name] = [TUNABLE[name](value) for value in values.split(',')]
+    return sweep
+
+
+def scripted_policy(rng: random.Random) -> Callable[[GameEngine], Action]:
+    distances = Distances()
+
+    def policy(engine: GameEngine) -> Action:
+        if engine.player.charges > 0:
+            for row, col in engine.get_movable_cells():
+                robot_id = engine.robot_cells.get((row, col))
+                if robot_id is not None and robot_id not in engine.pinged:
+                    return 'ping', row, col
+        return rollout_action(engine, distances, rng, greed=0.9)
+    return policy
+
+
+def simulate(difficulty: str, overrides: dict, seeds: list[int], max_turns: int) -> dict:
+    game_config = GameConfig.load(difficulty).replace(difficulty_settings=overrides)
+    engine = GameEngine(game_config, seed=seeds[0])
+
+    outcomes = Counter()
+    turns = []
+    for seed in seeds:
+        engine.reset(seed)
+        outcome = engine.play(scripted_policy(random.Random(seed)), max_turns=max_turns)
+        outcomes[outcome or 'timeout'] += 1
+        turns.append(engine.turn)
+    return {'outcomes': dict(outcomes), 'turns': turns}
+
+
+def wilson_interval(successes: int, total: int, z: float = Z_95) -> tuple[float, float]:
+    if total == 0:
+        return 0.0, 1.0
+    rate = successes / total
+    denominator = 1 + z * z / total
+    centre = (rate + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def summarize(overrides: dict, outcomes: Counter, turns: list[int]) -> dict:
+    games = len(turns)
+    mean = sum(turns) / games
+    variance = sum((turn - mean) ** 2 for turn in turns) / (games - 1) if games > 1 else 0.0
+    summary = {'settings': overrides, 'games': games}
+    for outcome in OUTCOMES:
+        low, high = wilson_interval(outcomes[outcome], games)
+        summary[outcome] = {'rate': outcomes[outcome] / games, 'low': low, 'high': high}
+    summary['turns'] = {'mean': mean, 'margin': Z_95 * math.sqrt(variance / games)}
+    return summary
+
+
+def calibrate(difficulty: str,
+              sweep: dict[str, list],
+              games: int,
+              workers: int = 0,
+              seed: int = 0,
+              max_turns: int = 300,
+              chunk_size: int = 50
+              ) -> list[dict]:
+    names = list(sweep)
+    settings = [dict(zip(names, values)) for values in itertools.product(*sweep.values())] or [{}]
+    seeds = [seed + index for index in range(games)]
+    chunks = [seeds[start:start + chunk_size] for start in range(0, games, chunk_size)]
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as executor:
+        futures = [[executor.submit(simulate, difficulty, overrides, chunk, max_turns) for chunk in chunks]
+                   for overrides in settings]
+
+        results = []
+        for overrides, setting_futures in zip(settings, futures):
+            outcomes = Counter()
+            turns = []
+            for future in setting_futures:
+                result = future.result()
+                outcomes.update(result['outcomes'])
+                turns.extend(result['turns'])
+            results.append(summarize(overrides, outcomes, turns))
+    return results
+
+
+def print_report(difficulty: str, results: list[dict]) -> None:
+    print(f"{difficulty}: {results[0]['games']} games per setting")
+    for result in results:
+        settings = ', '.join(f"{name}={value}" for name, value in result['settings'].items()) or 'current'
+        rates = '  '.join(f"{outcome} {result[outcome]['rate']:.1%} "
+                          f"[{result[outcome]['low']:.1%}-{result[outcome]['high']:.1%}]" for outcome in OUTCOMES)
+        print(f"  {settings}\n    {rates}  turns {result['turns']['mean']:.1f}±{result['turns']['margin']:.1f}")
+
+
+def write_back(difficulty: str, settings: dict, path: str = 'difficulties.json') -> None:
+    with open(path, 'r') as f:
+        difficulties = json.load(f)
+    difficulties[difficulty].update(settings)
+    with open(path, 'w') as f:
+        json.dump(difficulties, f, indent=2)
+        f.write('\n')
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Sweep difficulty settings and report how a scripted player fares.")
+    parser.add_argument('--difficulty', default='normal')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1,V2',
+                        help="values to sweep for a difficulty setting; repeat for a grid")
+    parser.add_argument('--games', type=int, default=500, help="games per setting")
+    parser.add_argument('--workers', type=int, default=0, help="processes to use (default: all cores)")
+    parser.add_argument('--max-turns', type=int, default=300)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="write the results as JSON to this path")
+    parser.add_argument('--target-win-rate', type=float, help="write the closest setting back to difficulties.json")
+    args = parser.parse_args(argv)
+
+    results = calibrate(args.difficulty, parse_sweep(args.set), args.games, args.workers, args.seed, args.max_turns)
+    print_report(args.difficulty, results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.target_win_rate is not None:
+        best = min(results, key=lambda result: abs(result['win']['rate'] - args.target_win_rate))
+        write_back(args.difficulty, best['settings'])
+        print(f"wrote {best['settings']} to difficulties.json ({best['win']['rate']:.1%} wins)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
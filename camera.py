@@ -0,0 +1,29 @@
+class Camera:
+    def __init__(self, rows: int, cols: int, view_rows: int, view_cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.view_rows = min(view_rows, rows)
+        self.view_cols = min(view_cols, cols)
+        self.margin_rows = self.view_rows // 4
+        self.margin_cols = self.view_cols // 4
+        self.top = 0
+        self.left = 0
+
+    def follow(self, row: int, col: int) -> bool:
+        top = self._scroll(self.top, row, self.view_rows, self.rows, self.margin_rows)
+        left = self._scroll(self.left, col, self.view_cols, self.cols, self.margin_cols)
+        moved = (top, left) != (self.top, self.left)
+        self.top, self.left = top, left
+        return moved
+
+    @staticmethod
+    def _scroll(start: int, position: int, view: int, size: int, margin: int) -> int:
+        if start + margin <= position < start + view - margin:
+            return start
+        return min(max(position - view // 2, 0), size - view)
+
+    def contains(self, row: int, col: int) -> bool:
+        return self.top <= row < self.top + self.view_rows and self.left <= col < self.left + self.view_cols
+
+    def to_world(self, row: int, col: int) -> tuple[int, int]:
+        return row + self.top, col + self.left
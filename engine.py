@@ -0,0 +1,298 @@
+import copy
+import os
+import random
+import sys
+from typing import Callable
+
+import numpy as np
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
+
+import game_core_ext
+import map_generator_ext
+import player_core_ext
+import robot_core_ext
+
+from game_config import GameConfig
+from replay import Replay, ReplayRecorder
+from snapshot import Snapshot, encode
+
+Action = tuple[str, int, int]
+
+HAZARD_CLEFT = robot_core_ext.HAZARD_CLEFT
+HAZARD_SCRAP = robot_core_ext.HAZARD_SCRAP
+
+
+class PlayerState:
+    __slots__ = ('x', 'y', 'charges', 'max_charges', 'keys')
+
+    def __init__(self, x: int, y: int, max_charges: int):
+        self.x = x
+        self.y = y
+        self.charges = max_charges
+        self.max_charges = max_charges
+        self.keys = 0
+
+    def position(self) -> tuple[int, int]:
+        return self.x, self.y
+
+    def copy(self) -> 'PlayerState':
+        player = PlayerState(self.x, self.y, self.max_charges)
+        player.charges = self.charges
+        player.keys = self.keys
+        return player
+
+
+class GameEngine:
+    def __init__(self, game_config: GameConfig, seed: int | None = None):
+        self.game_config = game_config
+        self.rng = random.Random(seed)
+
+        self.number_of_keys = game_config.number_of_keys
+        self.exit_pos = game_config.exit_position
+        self.max_charges = game_config.max_charges
+        self.robot_ai = game_config.robot_ai
+        self.cleft_code = game_config.cell_codes['cleft']
+        self.scrap_code = game_config.cell_codes['scrap']
+
+        self.cfg_data = game_config.cfg_data
+        self.reset()
+
+    def reset(self, seed: int | None = None) -> None:
+        self.seed = self.rng.getrandbits(64) if seed is None else seed
+        self.load_map(map_generator_ext.generate_map(self.cfg_data, self.seed))
+        self.recorder = ReplayRecorder(self.game_config.difficulty, self.seed)
+
+    def generate_maps(self, seeds: list[int], threads: int = 0) -> np.ndarray:
+        return map_generator_ext.generate_maps(self.cfg_data, seeds, threads)
+
+    def load_map(self, game_map: np.ndarray) -> None:
+        self.map = game_map
+        self.hazards = self._build_hazards()
+        self.recorder = None
+        codes = self.game_config.cell_codes
+        robots, charges, keys, player_pos = game_core_ext.convert_map(game_map, codes['robot'], codes['charge'],
+                                                                      codes['key'], codes['player'])
+
+        self.robots = {robot_id: tuple(pos) for robot_id, pos in enumerate(robots)}
+        self.robot_cells = {position: robot_id for robot_id, position in self.robots.items()}
+        self.pinged = set()
+        self.charges = {tuple(pos) for pos in charges}
+        self.keys = {tuple(pos) for pos in keys}
+        self.player = PlayerState(player_pos[0], player_pos[1], self.max_charges)
+
+        self.player_turn = True
+        self.outcome = None
+        self.turn = 0
+
+    def clone(self) -> 'GameEngine':
+        clone = copy.copy(self)
+        clone.rng = random.Random()
+        clone.rng.setstate(self.rng.getstate())
+        clone.map = self.map.copy()
+        clone.hazards = self.hazards.copy()
+        clone.robots = self.robots.copy()
+        clone.robot_cells = self.robot_cells.copy()
+        clone.pinged = self.pinged.copy()
+        clone.charges = self.charges.copy()
+        clone.keys = self.keys.copy()
+        clone.player = self.player.copy()
+        clone.recorder = None
+        return clone
+
+    def state(self) -> dict:
+        return {
+            'seed': self.seed,
+            'map': self.map.copy(),
+            'robots': self.robots.copy(),
+            'pinged': self.pinged.copy(),
+            'charges': self.charges.copy(),
+            'keys': self.keys.copy(),
+            'player': (self.player.x, self.player.y, self.player.charges, self.player.keys),
+            'player_turn': self.player_turn,
+            'outcome': self.outcome,
+            'turn': self.turn,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.seed = state['seed']
+        self.map = state['map'].copy()
+        self.hazards = self._build_hazards()
+        self.robots = dict(state['robots'])
+        self.robot_cells = {position: robot_id for robot_id, position in self.robots.items()}
+        self.pinged = set(state['pinged'])
+        self.charges = set(state['charges'])
+        self.keys = set(state['keys'])
+        x, y, charges, keys = state['player']
+        self.player = PlayerState(x, y, self.max_charges)
+        self.player.charges, self.player.keys = charges, keys
+        self.player_turn = state['player_turn']
+        self.outcome = state['outcome']
+        self.turn = state['turn']
+        self.recorder = None
+
+    def snapshot(self) -> bytes:
+        return encode(self.game_config.difficulty, self.state(), self.rng.getstate())
+
+    def load_snapshot(self, snapshot: Snapshot) -> None:
+        if snapshot.difficulty != self.game_config.difficulty:
+            raise ValueError(f"Snapshot was taken on '{snapshot.difficulty}', not '{self.game_config.difficulty}'")
+        shape = (self.game_config.rows, self.game_config.cols)
+        if snapshot.state['map'].shape != shape:
+            raise ValueError(f"Snapshot map is {snapshot.state['map'].shape}, expected {shape}")
+        self.restore(snapshot.state)
+        self.rng.setstate(snapshot.rng_state)
+
+    def legal_actions(self) -> list[Action]:
+        if self.outcome is not None or not self.player_turn:
+            return []
+        actions = [('move', row, col) for row, col in self.get_movable_cells()]
+        for row, col in self.get_movable_cells():
+            robot_id = self.robot_cells.get((row, col))
+            if robot_id is not None and (robot_id in self.pinged or self.player.charges > 0):
+                actions.append(('ping', row, col))
+        return actions
+
+    def get_movable_cells(self) -> list[tuple[int, int]]:
+        return player_core_ext.get_movable_cells(self.player.x, self.player.y, self.map)
+
+    def is_movable(self, row: int, col: int) -> bool:
+        rows, cols = self.map.shape
+        return (0 <= row < rows and 0 <= col < cols
+                and abs(row - self.player.x) <= 1 and abs(col - self.player.y) <= 1)
+
+    def robot_at(self, row: int, col: int) -> int | None:
+        return self.robot_cells.get((row, col))
+
+    def ping(self, row: int, col: int) -> bool:
+        if self.outcome is not None or not self.player_turn:
+            return False
+        if not self.is_movable(row, col):
+            return False
+
+        robot_id = self.robot_at(row, col)
+        if robot_id is None:
+            return False
+
+        if robot_id in self.pinged:
+            self.pinged.remove(robot_id)
+            self.player.charges += 1
+        elif self.player.charges > 0:
+            self.pinged.add(robot_id)
+            self.player.charges -= 1
+        else:
+            return False
+
+        if self.recorder is not None:
+            self.recorder.record('ping', row, col)
+        return True
+
+    def move(self, row: int, col: int) -> bool:
+        if self.outcome is not None or not self.player_turn:
+            return False
+        if not self.is_movable(row, col):
+            return False
+        if self.recorder is not None:
+            self.recorder.record('move', row, col)
+
+        self._kill_pinged_robots()
+        self.player.x, self.player.y = row, col
+
+        position = (row, col)
+        if position in self.charges and self.player.charges < self.player.max_charges:
+            self.charges.remove(position)
+            self.player.charges += 1
+        if position in self.keys:
+            self.keys.remove(position)
+            self.player.keys += 1
+
+        self.player_turn = False
+
+        if position == self.exit_pos and self.player.keys >= self.number_of_keys:
+            self.outcome = 'win'
+            return True
+
+        self._check_collision()
+        self._check_cleft()
+        return True
+
+    def move_robots(self) -> None:
+        if self.outcome is not None or self.player_turn:
+            return
+
+        results = robot_core_ext.update_robots(list(self.robots.values()), self.player.x, self.player.y,
+                                               self.hazards, self.robot_ai)
+        self.robot_cells = {}
+        for robot_id, (new_x, new_y, state) in zip(list(self.robots), results):
+            if state == robot_core_ext.ACTIVE:
+                self.robots[robot_id] = (new_x, new_y)
+                self.robot_cells[(new_x, new_y)] = robot_id
+            else:
+                if state == robot_core_ext.WRECKED:
+                    self.map[new_x, new_y] = self.scrap_code
+                    self.hazards[new_x, new_y] |= HAZARD_SCRAP
+                del self.robots[robot_id]
+                self.pinged.discard(robot_id)
+
+        self._check_collision()
+        self.player_turn = True
+        self.turn += 1
+
+    def apply(self, action: str, row: int, col: int) -> bool:
+        match action:
+            case 'move':
+                if not self.move(row, col):
+                    return False
+                self.move_robots()
+                return True
+            case 'ping':
+                return self.ping(row, col)
+            case _:
+                raise ValueError(f"Unknown action: {action}")
+
+    def replay(self) -> Replay:
+        if self.recorder is None:
+            raise ValueError("This game is not being recorded; start it with reset()")
+        return self.recorder.replay(self.outcome, self.turn)
+
+    def load_replay(self, replay: Replay, turn: int | None = None) -> None:
+        if replay.difficulty != self.game_config.difficulty:
+            raise ValueError(f"Replay was recorded on '{replay.difficulty}', not '{self.game_config.difficulty}'")
+
+        self.reset(replay.seed)
+        for action, row, col in replay.actions:
+            if turn is not None and self.turn >= turn:
+                break
+            if not self.apply(action, row, col):
+                raise ValueError(f"Replay action {action} ({row}, {col}) is illegal on turn {self.turn}")
+
+    def play(self, policy: Callable[['GameEngine'], Action], max_turns: int = 1000) -> str | None:
+        while self.outcome is None and self.turn < max_turns:
+            action, row, col = policy(self)
+            if not self.apply(action, row, col):
+                raise ValueError(f"Policy chose an illegal action: {action} ({row}, {col})")
+        return self.outcome
+
+    def _build_hazards(self) -> np.ndarray:
+        hazards = np.zeros(self.map.shape, dtype=np.uint8)
+        hazards[self.map == self.cleft_code] = HAZARD_CLEFT
+        hazards[self.map == self.scrap_code] = HAZARD_SCRAP
+        return hazards
+
+    def _kill_pinged_robots(self) -> None:
+        for robot_id in self.pinged:
+            position = self.robots.pop(robot_id, None)
+            if position is not None:
+                self.robot_cells.pop(position, None)
+        self.pinged.clear()
+
+    def _check_collision(self) -> None:
+        if self.outcome is not None:
+            return
+        if self.player.position() in self.robot_cells:
+            self.outcome = 'robot'
+
+    def _check_cleft(self) -> None:
+        if self.outcome is not None:
+            return
+        if self.hazards[self.player.x, self.player.y] & HAZARD_CLEFT:
+            self.outcome = 'cleft'
@@ -1,166 +1,264 @@
 import os
 import sys
+import time
+from typing import Callable
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
 
 import pygame
 
-import map_generator_ext
 import game_core_ext
+import map_generator_ext
+import player_core_ext
+import robot_core_ext
 
+from assets import asset_cache
+from engine import Action, GameEngine, PlayerState
 from game_config import GameConfig
-from game_over_screen import GameOverScreen
 from game_renderer import GameRenderer
 from models import Charge, Key
-from models.player import Player
 from models.robot import Robot
+from profiler import profiler, startup
+from replay import Replay
+from snapshot import Snapshot, save
+from scheduler import FrameScheduler
 from sound_manager import SoundManager
 from start_menu import StartMenu
-from utils import load_sprite_sheet, load_sprite
 
 class Game:
-    def __init__(self):
+    def __init__(self, bot: Callable[[GameEngine], Action | None] | None = None, difficulty: str | None = None):
         pygame.init()
-        self.sound_manager = SoundManager()
-
-        self.screen = pygame.display.set_mode((800, 600))
-        pygame.display.set_caption('Robot Battle')
-        start_menu = StartMenu(self.screen)
-        self.difficulty = start_menu.run()
-
-        self.game_config = GameConfig(difficulty=self.difficulty)
+        self.bot = bot
+        self.replay_dir = os.environ.get('ROBOTBATTLE_REPLAY_DIR')
+        self.autosave_path = os.environ.get('ROBOTBATTLE_AUTOSAVE')
+        self.sound_manager = SoundManager(preload=())
+        self.music_loaded = False
+
+        if difficulty is None:
+            self.screen = pygame.display.set_mode((800, 600))
+            pygame.display.set_caption('Robot Battle')
+            difficulty = StartMenu(self.screen).run()
+            startup.mark('difficulty selection', idle=True)
+        self.difficulty = difficulty
+
+        self.game_config = GameConfig.load(self.difficulty)
+        display = self.game_config.get_display_settings()
+        self.scheduler = FrameScheduler(self.game_config.max_fps, display.get("power_save", True))
         self._initialize_screen()
+        startup.mark('config and window')
 
         self.load_assets()
+        startup.mark('sprite atlas')
 
-        cfg_data = map_generator_ext.ConfigData()
-        grid = self.game_config.get_grid_settings()
-        gameplay = self.game_config.get_gameplay_settings()
-        diff = self.game_config.get_difficulty_settings()
-        textures = self.game_config.get_textures_settings()
-
-        cfg_data.rows = grid["rows"]
-        cfg_data.cols = grid["cols"]
-        cfg_data.default_textures = textures["default"]
-        cfg_data.player_pos = (gameplay["player_start_position"][0], gameplay["player_start_position"][1])
-        cfg_data.exit_pos = (gameplay["exit_position"][0], gameplay["exit_position"][1])
-        cfg_data.number_of_keys = gameplay["number_of_keys"]
-
-        cfg_data.clefts_coeff = diff["clefts_coefficient"]
-        cfg_data.initial_robots_coeff = diff["initial_robots_coefficient"]
-        cfg_data.charges_coeff = diff["charges_coefficient"]
-        cfg_data.key_coefficient = cfg_data.number_of_keys / (cfg_data.rows * cfg_data.cols)
-
-        cfg_data.cleft_char = textures["cleft"]
-        cfg_data.robot_char = textures["robot"]
-        cfg_data.charge_char = textures["charge"]
-        cfg_data.key_char = textures["key"]
-        cfg_data.player_char = textures["player"]
-        cfg_data.exit_char = textures["exit"]
-
-        self.map = map_generator_ext.generate_map(cfg_data)
+        self.engine = GameEngine(self.game_config)
+        self._initialize_renderer()
+        startup.mark('engine and renderer')
 
         self.robots = pygame.sprite.Group()
         self.keys = pygame.sprite.Group()
         self.charges = pygame.sprite.Group()
-        self.pinged_robots = []
-        self.player_turn = True
-        self.exit_pos = (gameplay["exit_position"][0], gameplay["exit_position"][1])
+        self.robot_sprites = {}
+        self.charge_sprites = {}
+        self.key_sprites = {}
+        self.exit_pos = self.engine.exit_pos
 
         self.convert_map()
+        self.resume_autosave()
+
+        self.show_profile = False
+        self.profile_rect = None
+        self._instrument()
+        startup.mark('sprites')
+
+    def _instrument(self) -> None:
+        if not profiler.enabled:
+            return
+        profiler.instrument(self, ('handle_events', 'check_for_collision', 'check_for_cleft', 'update_robots', 'render'))
+        for module in (game_core_ext, map_generator_ext, player_core_ext, robot_core_ext):
+            profiler.instrument_module(module)
+
+    def reset(self, difficulty: str | None = None) -> None:
+        if difficulty is not None and difficulty != self.difficulty:
+            layout = self.game_config.cell_size, self.game_config.screen_size
+            self.difficulty = difficulty
+            self.game_config = GameConfig.load(difficulty)
+            self.engine = GameEngine(self.game_config)
+            if (self.game_config.cell_size, self.game_config.screen_size) != layout:
+                self._initialize_screen()
+                self.load_assets()
+            self._initialize_renderer()
+            self.exit_pos = self.engine.exit_pos
+        else:
+            self.engine.reset()
+            self.renderer.invalidate()
 
-        self.play_background_music()
+        pygame.display.set_caption('Robot Battle')
+        self.rebuild_sprites()
+
+        self.resume_background_music()
+
+    def load_replay(self, replay: Replay, turn: int | None = None) -> None:
+        self.engine.load_replay(replay, turn)
+        self.renderer.invalidate()
+        self.rebuild_sprites()
+
+    def save_replay(self) -> None:
+        if not self.replay_dir or self.engine.recorder is None:
+            return
+        os.makedirs(self.replay_dir, exist_ok=True)
+        path = os.path.join(self.replay_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.engine.seed}.rbr")
+        self.engine.replay().save(path)
+
+    def load_snapshot(self, snapshot: Snapshot) -> None:
+        self.engine.load_snapshot(snapshot)
+        self.renderer.invalidate()
+        self.rebuild_sprites()
+
+    def autosave(self) -> None:
+        if self.autosave_path and self.engine.outcome is None:
+            save(self.engine.snapshot(), self.autosave_path)
+
+    def resume_autosave(self) -> None:
+        if not self.autosave_path or not os.path.exists(self.autosave_path):
+            return
+        try:
+            snapshot = Snapshot.load(self.autosave_path)
+        except ValueError as e:
+            print(f"Ignoring autosave {self.autosave_path}: {e}")
+            return
+        if snapshot.difficulty == self.difficulty and snapshot.state['outcome'] is None:
+            self.load_snapshot(snapshot)
+
+    def rebuild_sprites(self) -> None:
+        for group in (self.robots, self.keys, self.charges):
+            group.empty()
+        self.robot_sprites.clear()
+        self.charge_sprites.clear()
+        self.key_sprites.clear()
+        self.convert_map()
+        self.sync_sprites()
+
+    @property
+    def map(self):
+        return self.engine.map
+
+    @property
+    def player(self) -> PlayerState:
+        return self.engine.player
+
+    @property
+    def player_turn(self) -> bool:
+        return self.engine.player_turn
 
     def _initialize_screen(self) -> None:
-        rows = self.game_config.get_grid_settings()["rows"]
-        cols = self.game_config.get_grid_settings()["cols"]
-        cell_size = self.game_config.get_grid_settings()["cell_size"]
-        width, height = cols * cell_size, rows * cell_size
-        self.screen = pygame.display.set_mode((width, height))
+        self.screen = pygame.display.set_mode(self.game_config.screen_size)
         pygame.display.set_caption('Robot Battle')
 
-        self.clock = pygame.time.Clock()
+    def _initialize_renderer(self) -> None:
+        self.renderer = GameRenderer(
+            self.screen,
+            self.tiles,
+            self.player_image,
+            self.robot_image,
+            self.key_image,
+            self.charge_image,
+            self.game_config
+        )
 
     def load_assets(self) -> None:
-        cell_size = self.game_config.get_grid_settings()["cell_size"]
-        self.tiles = load_sprite_sheet('assets/tiles.png', cell_size, cell_size)
-        self.player_image = load_sprite('assets/astronaut.png', cell_size)
-        self.robot_image = load_sprite('assets/robot1.png', cell_size)
-        self.key_image = load_sprite('assets/key.png', cell_size)
-        self.charge_image = load_sprite('assets/charge.png', cell_size)
+        cell_size = self.game_config.cell_size
+        atlas = asset_cache.atlas(cell_size)
+        self.tiles = atlas.tiles
+        self.player_image = atlas.sprites['player']
+        self.robot_image = atlas.sprites['robot']
+        self.key_image = atlas.sprites['key']
+        self.charge_image = atlas.sprites['charge']
 
     def check_for_win(self) -> None:
-        if (self.player.x, self.player.y) == self.exit_pos and self.player.keys >= self.game_config.get_gameplay_settings()['number_of_keys']:
+        if self.engine.outcome == 'win':
             self._game_over(reason='win')
 
     def convert_map(self) -> None:
-        robots, charges, keys, player_pos = game_core_ext.convert_map(self.map)
-
-        for x, y in robots:
-            self.robots.add(Robot(x, y, self.robot_image, self.game_config.get_grid_settings()["cell_size"]))
-
-        for x, y in charges:
-            self.charges.add(Charge(x, y, self.charge_image, self.game_config.get_grid_settings()["cell_size"]))
-
-        for x, y in keys:
-            self.keys.add(Key(x, y, self.key_image, self.game_config.get_grid_settings()["cell_size"]))
-
-        if player_pos != (-1, -1):
-            self.player = Player(player_pos[0], player_pos[1],
-                                 self.game_config.get_difficulty_settings()['max_charges'])
+        cell_size = self.game_config.cell_size
+
+        for robot_id, (x, y) in self.engine.robots.items():
+            robot = Robot(x, y, self.robot_image, cell_size)
+            self.robot_sprites[robot_id] = robot
+            self.robots.add(robot)
+
+        for x, y in self.engine.charges:
+            charge = Charge(x, y, self.charge_image, cell_size)
+            self.charge_sprites[(x, y)] = charge
+            self.charges.add(charge)
+
+        for x, y in self.engine.keys:
+            key = Key(x, y, self.key_image, cell_size)
+            self.key_sprites[(x, y)] = key
+            self.keys.add(key)
+
+    def sync_sprites(self) -> None:
+        for robot_id, robot in list(self.robot_sprites.items()):
+            position = self.engine.robots.get(robot_id)
+            if position is None:
+                robot.kill()
+                del self.robot_sprites[robot_id]
+                continue
+            robot.x, robot.y = position
+            robot.is_pinged = robot_id in self.engine.pinged
+            robot._update_rect_position()
+
+    def remove_collected(self, sprites: dict, position: tuple[int, int]) -> None:
+        sprite = sprites.pop(position, None)
+        if sprite is not None:
+            sprite.kill()
 
     def get_cell_from_mouse(self, pos: tuple[int, int]) -> tuple[int, int]:
-        cell_size = self.game_config.get_grid_settings()["cell_size"]
+        cell_size = self.game_config.cell_size
         x, y = pos
         row, col = game_core_ext.get_cell_from_mouse(x, y, cell_size)
-        return row, col
-
-    def kill_pinged_robots(self) -> None:
-        for robot in self.pinged_robots:
-            robot.kill()
-        self.pinged_robots.clear()
+        return self.renderer.camera.to_world(row, col)
 
     def handle_right_click(self, row: int, col: int) -> None:
-        movable_cells = self.player.get_movable_cells(self.map)
-        for robot in self.robots:
-            if robot.position() == (row, col) and (row, col) in movable_cells:
-                if robot.is_pinged:
-                    robot.is_pinged = False
-                    if robot in self.pinged_robots:
-                        self.pinged_robots.remove(robot)
-                    self.player.charges += 1
-                else:
-                    if self.player.charges > 0 and robot not in self.pinged_robots:
-                        robot.is_pinged = True
-                        self.pinged_robots.append(robot)
-                        self.player.charges -= 1
-                break
+        if self.engine.ping(row, col):
+            robot_id = self.engine.robot_at(row, col)
+            self.robot_sprites[robot_id].is_pinged = robot_id in self.engine.pinged
 
     def handle_left_click(self, row: int, col: int) -> None:
-        movable_cells = self.player.get_movable_cells(self.map)
-        if (row, col) in movable_cells:
-            self.kill_pinged_robots()
-            self.player.move(row, col, self.robots, self.charges, self.keys, self.map)
+        charges, keys = self.player.charges, self.player.keys
+        if self.engine.move(row, col):
+            if self.player.charges > charges:
+                self.remove_collected(self.charge_sprites, (row, col))
+                self.sound_manager.play('collect_charge')
+            if self.player.keys > keys:
+                self.remove_collected(self.key_sprites, (row, col))
+                self.sound_manager.play('collect_key')
+            self.sync_sprites()
             self.sound_manager.play('move')
-            self.player_turn = False
 
             self.check_for_win()
 
     def check_for_collision(self) -> None:
-        x, y = self.player.x, self.player.y
-        robot_positions = [(robot.x, robot.y) for robot in self.robots]
-        if game_core_ext.check_for_collision(x, y, robot_positions):
+        if self.engine.outcome == 'robot':
             self._game_over(reason='robot')
 
     def check_for_cleft(self) -> None:
-        x, y = self.player.x, self.player.y
-        converted_map = [[str(cell) for cell in row] for row in self.map]
-        if game_core_ext.check_for_cleft(converted_map, x, y):
+        if self.engine.outcome == 'cleft':
             self._game_over(reason='cleft')
 
     def _game_over(self, reason: str) -> None:
+        import game_over_screen_ext
+        from game_over_screen import GameOverScreen
+        profiler.instrument_module(game_over_screen_ext)
+
         pygame.mixer.music.stop()
-        game_over_screen = GameOverScreen(self.screen.get_size(), self.screen.copy())
+        self.save_replay()
+        if self.autosave_path and os.path.exists(self.autosave_path):
+            os.remove(self.autosave_path)
+        game_over_screen = GameOverScreen(
+            self.screen.get_size(),
+            self.screen.copy(),
+            blur_downscale=self.game_config.get_display_settings().get("blur_downscale", 1)
+        )
 
         if reason == 'win':
             win_message = "Congratulations! You've won the game!"
@@ -170,7 +268,7 @@ class Game:
             result = game_over_screen.show(reason='lose', message=death_message)
 
         if result == 'restart':
-            self.__init__()
+            self.reset()
         else:
             pygame.quit()
             sys.exit()
@@ -184,34 +282,61 @@ class Game:
             pygame.mixer.music.load(music_path)
             pygame.mixer.music.set_volume(0.1)
             pygame.mixer.music.play(loops=-1)
+            self.music_loaded = True
         except pygame.error as e:
             print(f"Error loading background music: {e}")
 
+    def resume_background_music(self) -> None:
+        if not self.music_loaded:
+            return
+        try:
+            pygame.mixer.music.play(loops=-1)
+        except pygame.error as e:
+            print(f"Error resuming background music: {e}")
+
     def update_robots(self) -> None:
-        self.robots.update(self.player, self.map)
-        for robot in self.robots.copy():
-            if robot.is_dead(self.map):
-                self.robots.remove(robot)
+        self.engine.move_robots()
+        self.sync_sprites()
 
     def main_loop(self) -> None:
         while True:
-            self.handle_events()
+            self.handle_events(self.scheduler.wait(animating=self.bot is not None))
+            if self.bot is not None and self.player_turn and self.scheduler.frame_due:
+                self.play_bot_turn()
             self.check_for_collision()
             self.check_for_cleft()
 
             if not self.player_turn:
                 self.update_robots()
                 self.check_for_collision()
-                self.player_turn = True
+                self.autosave()
 
             self.render()
 
-    def handle_events(self) -> None:
-        for event in pygame.event.get():
+    def play_bot_turn(self) -> None:
+        choice = self.bot(self.engine)
+        if choice is None:
+            return
+        action, row, col = choice
+        match action:
+            case 'move': self.handle_left_click(row, col)
+            case 'ping': self.handle_right_click(row, col)
+
+    def handle_events(self, events: list[pygame.event.Event] | None = None) -> None:
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
 
+            if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.renderer.invalidate()
+
+            if profiler.enabled and event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.show_profile = not self.show_profile
+                if self.profile_rect is not None:
+                    self.renderer.mark_dirty(self.profile_rect)
+                    self.profile_rect = None
+
             if self.player_turn and event.type == pygame.MOUSEBUTTONDOWN:
                 row, col = self.get_cell_from_mouse(event.pos)
                 match event.button:
@@ -219,25 +344,35 @@ class Game:
                     case 3: self.handle_right_click(row, col)
 
     def render(self):
-        renderer = GameRenderer(
-            self.screen,
-            self.tiles,
-            self.player_image,
-            self.robot_image,
-            self.key_image,
-            self.charge_image,
-            self.game_config
-        )
-        renderer.render(
+        self.renderer.render(
             self.map,
-            self.keys,
-            self.charges,
+            self.engine.keys,
+            self.engine.charges,
             self.player,
-            self.robots,
-            self.player.get_movable_cells(self.map)
+            self.engine.robot_cells,
+            self.engine.pinged,
+            self.engine.get_movable_cells()
         )
+        if self.show_profile:
+            self.draw_profile_overlay()
+
+    def draw_profile_overlay(self) -> None:
+        font = asset_cache.font(os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf'), 8)
+        rect = profiler.draw_overlay(self.screen, font)
+        if self.profile_rect is not None:
+            self.renderer.mark_dirty(self.profile_rect)
+            rect = rect.union(self.profile_rect)
+        self.renderer.mark_dirty(rect)
+        self.profile_rect = rect
+        pygame.display.update(rect)
 
     def run(self):
+        self.render()
+        startup.mark('first frame')
+        self.play_background_music()
+        self.sound_manager.preload()
+        startup.mark('music and sounds')
+        startup.print_report()
         self.main_loop()
 
 
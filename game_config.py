@@ -1,56 +1,218 @@
 import json
+import os
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
+
+import map_generator_ext
+import robot_core_ext
+
+ROBOT_AI = {
+    'greedy': robot_core_ext.GREEDY,
+    'pathfinding': robot_core_ext.PATHFINDING,
+}
+CELL_OBJECTS = ('cleft', 'robot', 'charge', 'key', 'player', 'exit', 'scrap')
+COEFFICIENTS = ('clefts_coefficient', 'initial_robots_coefficient', 'charges_coefficient')
+SECTIONS = ('grid', 'gameplay', 'colors', 'display')
+
+_compiled = {}
+
+
+def freeze(value):
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
 
 
 class GameConfig:
+    __slots__ = ('difficulty', 'config', 'difficulty_settings', 'textures',
+                 'rows', 'cols', 'cell_size', 'viewport_rows', 'viewport_cols', 'screen_size',
+                 'number_of_keys', 'player_start', 'exit_position', 'key_coefficient',
+                 'max_charges', 'robot_ai', 'cell_codes', 'object_codes', 'max_fps', 'cfg_data')
+
     def __init__(self,
                  difficulty: str,
                  config_path: str = 'config.json',
                  difficulties_path: str ='difficulties.json',
                  textures_path: str ='textures.json'):
-        self.difficulty = difficulty
-        self.config = {}
-        self.difficulty_settings = {}
-        self.textures = {}
+        config = self._read(config_path)
 
-        self._load_config(config_path)
-        self._load_difficulties(difficulties_path)
-        self._load_textures(textures_path)
+        all_difficulties = self._read(difficulties_path)
+        if difficulty not in all_difficulties:
+            raise ValueError(f"Difficulty '{difficulty}' not found in {difficulties_path}")
 
-        self._apply_difficulty()
+        textures = self._read(textures_path)
+        if difficulty not in textures.get("default", {}):
+            raise ValueError(f"Default textures for difficulty '{difficulty}' not found.")
+        textures["default"] = textures["default"][difficulty]
 
-    def _load_config(self, path: str) -> None:
-        with open(path, 'r') as f:
-            self.config = json.load(f)
+        self._compile(difficulty, config, all_difficulties[difficulty], textures)
 
-    def _load_difficulties(self, path: str) -> None:
-        with open(path, 'r') as f:
-            all_difficulties = json.load(f)
-        if self.difficulty in all_difficulties:
-            self.difficulty_settings = all_difficulties[self.difficulty]
-        else:
-            raise ValueError(f"Difficulty '{self.difficulty}' not found in {path}")
+    @classmethod
+    def load(cls,
+             difficulty: str,
+             config_path: str = 'config.json',
+             difficulties_path: str = 'difficulties.json',
+             textures_path: str = 'textures.json'
+             ) -> 'GameConfig':
+        paths = (config_path, difficulties_path, textures_path)
+        key = (difficulty, paths, tuple(os.stat(path).st_mtime_ns for path in paths))
+        config = _compiled.get(key)
+        if config is None:
+            config = _compiled[key] = cls(difficulty, *paths)
+        return config
 
-    def _load_textures(self, path: str) -> None:
+    @staticmethod
+    def _read(path: str) -> dict:
         with open(path, 'r') as f:
-            self.textures = json.load(f)
+            return json.load(f)
+
+    def _compile(self, difficulty: str, config: dict, difficulty_settings: dict, textures: dict) -> None:
+        grid = config.get("grid", {})
+        gameplay = config.get("gameplay", {})
+        display = config.get("display", {})
+
+        rows, cols, cell_size = (self._positive(grid, name) for name in ("rows", "cols", "cell_size"))
+        viewport_rows = min(self._positive(grid, "viewport_rows", rows), rows)
+        viewport_cols = min(self._positive(grid, "viewport_cols", cols), cols)
+
+        number_of_keys = gameplay.get("number_of_keys")
+        if not isinstance(number_of_keys, int) or number_of_keys < 1:
+            raise ValueError(f"gameplay.number_of_keys must be a positive integer, got {number_of_keys!r}")
+        player_start = self._position(gameplay, "player_start_position", rows, cols)
+        exit_position = self._position(gameplay, "exit_position", rows, cols)
 
-    def _apply_difficulty(self) -> None:
-        if "default" in self.textures and self.difficulty in self.textures["default"]:
-            self.textures["default"] = self.textures["default"][self.difficulty]
-        else:
-            raise ValueError(f"Default textures for difficulty '{self.difficulty}' not found.")
+        max_fps = display.get("max_fps", 60)
+        if not isinstance(max_fps, int) or max_fps < 1:
+            raise ValueError(f"display.max_fps must be a positive integer, got {max_fps!r}")
 
-    def get_grid_settings(self) -> dict:
+        for name in COEFFICIENTS:
+            value = difficulty_settings.get(name)
+            if not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                raise ValueError(f"{difficulty}.{name} must be between 0 and 1, got {value!r}")
+        max_charges = difficulty_settings.get("max_charges")
+        if not isinstance(max_charges, int) or max_charges < 0:
+            raise ValueError(f"{difficulty}.max_charges must be a non-negative integer, got {max_charges!r}")
+        robot_ai = difficulty_settings.get("robot_ai", "greedy")
+        if robot_ai not in ROBOT_AI:
+            raise ValueError(f"Unknown robot AI '{robot_ai}' for difficulty '{difficulty}'")
+
+        for name in CELL_OBJECTS:
+            if not isinstance(textures.get(name), str) or len(textures[name]) != 1:
+                raise ValueError(f"textures.{name} must be a single character, got {textures.get(name)!r}")
+        default_textures = textures["default"]
+        if not default_textures or not all(isinstance(tile, int) and tile > 0 for tile in default_textures):
+            raise ValueError(f"Default textures for difficulty '{difficulty}' must be positive tile indices")
+        cell_codes = {name: ord(textures[name]) for name in CELL_OBJECTS}
+
+        cfg_data = map_generator_ext.ConfigData()
+        cfg_data.rows = rows
+        cfg_data.cols = cols
+        cfg_data.default_textures = list(default_textures)
+        cfg_data.player_pos = player_start
+        cfg_data.exit_pos = exit_position
+        cfg_data.number_of_keys = number_of_keys
+        cfg_data.clefts_coeff = difficulty_settings["clefts_coefficient"]
+        cfg_data.initial_robots_coeff = difficulty_settings["initial_robots_coefficient"]
+        cfg_data.charges_coeff = difficulty_settings["charges_coefficient"]
+        cfg_data.key_coefficient = number_of_keys / (rows * cols)
+        cfg_data.cleft_char = textures["cleft"]
+        cfg_data.robot_char = textures["robot"]
+        cfg_data.charge_char = textures["charge"]
+        cfg_data.key_char = textures["key"]
+        cfg_data.player_char = textures["player"]
+        cfg_data.exit_char = textures["exit"]
+
+        compiled = {
+            'difficulty': difficulty,
+            'config': freeze(config),
+            'difficulty_settings': freeze(difficulty_settings),
+            'textures': freeze(textures),
+            'rows': rows,
+            'cols': cols,
+            'cell_size': cell_size,
+            'viewport_rows': viewport_rows,
+            'viewport_cols': viewport_cols,
+            'screen_size': (viewport_cols * cell_size, viewport_rows * cell_size),
+            'number_of_keys': number_of_keys,
+            'player_start': player_start,
+            'exit_position': exit_position,
+            'key_coefficient': cfg_data.key_coefficient,
+            'max_charges': max_charges,
+            'robot_ai': ROBOT_AI[robot_ai],
+            'cell_codes': MappingProxyType(cell_codes),
+            'object_codes': frozenset(cell_codes[name] for name in ('robot', 'charge', 'key', 'player', 'exit')),
+            'max_fps': max_fps,
+            'cfg_data': cfg_data,
+        }
+        for name, value in compiled.items():
+            object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _positive(section: dict, name: str, default: int | None = None) -> int:
+        value = section.get(name, default)
+        if not isinstance(value, int) or value < 1:
+            raise ValueError(f"grid.{name} must be a positive integer, got {value!r}")
+        return value
+
+    @staticmethod
+    def _position(section: dict, name: str, rows: int, cols: int) -> tuple[int, int]:
+        value = section.get(name)
+        if (not isinstance(value, (list, tuple)) or len(value) != 2
+                or not 0 <= value[0] < rows or not 0 <= value[1] < cols):
+            raise ValueError(f"gameplay.{name} must be a cell inside the {rows}x{cols} grid, got {value!r}")
+        return value[0], value[1]
+
+    def replace(self, difficulty_settings: dict | None = None, **sections: dict) -> 'GameConfig':
+        config = thaw(self.config)
+        for name, overrides in sections.items():
+            if name not in SECTIONS:
+                raise ValueError(f"Unknown config section '{name}'")
+            config[name] = dict(config.get(name, {}), **overrides)
+
+        replaced = object.__new__(GameConfig)
+        replaced._compile(self.difficulty, config, dict(thaw(self.difficulty_settings), **(difficulty_settings or {})),
+                          thaw(self.textures))
+        return replaced
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"GameConfig is immutable; use replace() to change '{name}'")
+
+    def __reduce__(self):
+        return _rebuild, (self.difficulty, thaw(self.config), thaw(self.difficulty_settings), thaw(self.textures))
+
+    def get_grid_settings(self) -> Mapping:
         return self.config.get("grid", {})
 
-    def get_gameplay_settings(self) -> dict:
+    def get_gameplay_settings(self) -> Mapping:
         return self.config.get("gameplay", {})
 
-    def get_color_settings(self) -> dict:
+    def get_color_settings(self) -> Mapping:
         return self.config.get("colors", {})
 
-    def get_difficulty_settings(self) -> dict:
+    def get_display_settings(self) -> Mapping:
+        return self.config.get("display", {})
+
+    def get_difficulty_settings(self) -> Mapping:
         return self.difficulty_settings
 
-    def get_textures_settings(self) -> dict:
-        return self.textures
\ No newline at end of file
+    def get_textures_settings(self) -> Mapping:
+        return self.textures
+
+
+def _rebuild(difficulty: str, config: dict, difficulty_settings: dict, textures: dict) -> GameConfig:
+    game_config = object.__new__(GameConfig)
+    game_config._compile(difficulty, config, difficulty_settings, textures)
+    return game_config
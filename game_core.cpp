@@ -6,6 +6,8 @@
 #include <map>
 #include <random>
 
+#include "grid.hpp"
+
 namespace py = pybind11;
 
 std::pair<int, int> get_cell_from_mouse(int x, int y, int cell_size) {
@@ -14,13 +16,13 @@ std::pair<int, int> get_cell_from_mouse(int x, int y, int cell_size) {
     return {row, col};
 }
 
-bool check_for_cleft(const std::vector<std::vector<std::string>>& game_map, int player_x, int player_y) {
-    if (player_x < 0 || player_x >= static_cast<int>(game_map.size()) ||
-        player_y < 0 || player_y >= static_cast<int>(game_map[0].size())) {
+bool check_for_cleft(const Grid& game_map, int player_x, int player_y, uint8_t cleft_code) {
+    GridView grid(game_map);
+    if (!grid.contains(player_x, player_y)) {
         throw std::out_of_range("Player position out of game map bounds.");
     }
 
-    return game_map[player_x][player_y] == "C";
+    return grid.at(player_x, player_y) == cleft_code;
 }
 
 std::string select_death_message(const std::string& reason) {
@@ -80,23 +82,24 @@ std::tuple<std::vector<std::tuple<int, int>>,
            std::vector<std::tuple<int, int>>,
            std::vector<std::tuple<int, int>>,
            std::tuple<int, int>>
-convert_map(const std::vector<std::vector<std::string>>& game_map) {
+convert_map(const Grid& game_map, uint8_t robot_code, uint8_t charge_code, uint8_t key_code, uint8_t player_code) {
+    GridView grid(game_map);
     std::vector<std::tuple<int, int>> robots;
     std::vector<std::tuple<int, int>> charges;
     std::vector<std::tuple<int, int>> keys;
     std::tuple<int, int> player = {-1, -1};
 
-    for (size_t x = 0; x < game_map.size(); ++x) {
-        for (size_t y = 0; y < game_map[x].size(); ++y) {
-            const std::string& cell = game_map[x][y];
-            if (cell == "R") {
-                robots.emplace_back(static_cast<int>(x), static_cast<int>(y));
-            } else if (cell == "G") {
-                charges.emplace_back(static_cast<int>(x), static_cast<int>(y));
-            } else if (cell == "K") {
-                keys.emplace_back(static_cast<int>(x), static_cast<int>(y));
-            } else if (cell == "P") {
-                player = {static_cast<int>(x), static_cast<int>(y)};
+    for (int x = 0; x < grid.rows; ++x) {
+        for (int y = 0; y < grid.cols; ++y) {
+            uint8_t cell = grid.at(x, y);
+            if (cell == robot_code) {
+                robots.emplace_back(x, y);
+            } else if (cell == charge_code) {
+                charges.emplace_back(x, y);
+            } else if (cell == key_code) {
+                keys.emplace_back(x, y);
+            } else if (cell == player_code) {
+                player = {x, y};
             }
         }
     }
@@ -111,7 +114,7 @@ PYBIND11_MODULE(game_core_ext, m) {
           py::arg("x"), py::arg("y"), py::arg("cell_size"));
 
     m.def("check_for_cleft", &check_for_cleft, "Check if player is on a cleft",
-          py::arg("game_map"), py::arg("player_x"), py::arg("player_y"));
+          py::arg("game_map").noconvert(), py::arg("player_x"), py::arg("player_y"), py::arg("cleft_code"));
 
     m.def("select_death_message", &select_death_message, "Select a random death message based on the reason",
           py::arg("reason"));
@@ -120,5 +123,6 @@ PYBIND11_MODULE(game_core_ext, m) {
           py::arg("player_x"), py::arg("player_y"), py::arg("robots"));
 
     m.def("convert_map", &convert_map, "Convert the game map into structured objects",
-          py::arg("game_map"));
+          py::arg("game_map").noconvert(), py::arg("robot_code"), py::arg("charge_code"), py::arg("key_code"),
+          py::arg("player_code"));
 }
\ No newline at end of file
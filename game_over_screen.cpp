@@ -1,5 +1,10 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/numpy.h>
+#include <algorithm>
+#include <cstdint>
+#include <stdexcept>
+#include <thread>
 #include <vector>
 #include <string>
 #include <sstream>
@@ -28,39 +33,83 @@ std::vector<std::string> wrap_text(const std::string& text, size_t max_width, si
 
 
 
-std::vector<std::vector<std::vector<int>>> apply_gaussian_blur(
-    const std::vector<std::vector<std::vector<int>>>& image, double sigma) {
-
-    int height = image.size();
-    int width = image[0].size();
-    int kernel_radius = std::ceil(3 * sigma);
-
-    std::vector<std::vector<std::vector<int>>> blurred_image(height, std::vector<std::vector<int>>(width, {0, 0, 0}));
-
-    std::vector<double> kernel(2 * kernel_radius + 1);
+std::vector<int32_t> make_kernel(double sigma, int kernel_radius) {
+    std::vector<double> weights(2 * kernel_radius + 1);
     double sum = 0.0;
     for (int i = -kernel_radius; i <= kernel_radius; ++i) {
-        kernel[i + kernel_radius] = std::exp(-0.5 * (i * i) / (sigma * sigma));
-        sum += kernel[i + kernel_radius];
+        weights[i + kernel_radius] = std::exp(-0.5 * (i * i) / (sigma * sigma));
+        sum += weights[i + kernel_radius];
     }
-    for (auto& k : kernel) k /= sum;
-
-    for (int y = 0; y < height; ++y) {
-        for (int x = 0; x < width; ++x) {
-            std::vector<double> temp(3, 0.0);
-            for (int i = -kernel_radius; i <= kernel_radius; ++i) {
-                int ny = std::clamp(y + i, 0, height - 1);
-                for (int c = 0; c < 3; ++c) {
-                    temp[c] += image[ny][x][c] * kernel[i + kernel_radius];
-                }
+
+    std::vector<int32_t> kernel(weights.size());
+    for (size_t i = 0; i < weights.size(); ++i) {
+        kernel[i] = static_cast<int32_t>(std::lround(weights[i] / sum * 65536.0));
+    }
+    return kernel;
+}
+
+// Blurs every line along `axis` for the lines in [begin, end) of the other axis.
+template <typename Pixels>
+void blur_lines(Pixels& pixels, int axis, int begin, int end, const std::vector<int32_t>& kernel) {
+    int kernel_radius = static_cast<int>(kernel.size() / 2);
+    int length = static_cast<int>(pixels.shape(axis));
+    int channels = static_cast<int>(pixels.shape(2));
+    std::vector<uint8_t> line(length);
+
+    for (int other = begin; other < end; ++other) {
+        for (int c = 0; c < channels; ++c) {
+            for (int i = 0; i < length; ++i) {
+                line[i] = axis == 0 ? pixels(i, other, c) : pixels(other, i, c);
             }
-            for (int c = 0; c < 3; ++c) {
-                blurred_image[y][x][c] = static_cast<int>(temp[c]);
+            for (int i = 0; i < length; ++i) {
+                int64_t acc = 0;
+                for (int k = -kernel_radius; k <= kernel_radius; ++k) {
+                    acc += static_cast<int64_t>(line[std::clamp(i + k, 0, length - 1)]) * kernel[k + kernel_radius];
+                }
+                uint8_t value = static_cast<uint8_t>(std::clamp<int64_t>((acc + 32768) >> 16, 0, 255));
+                if (axis == 0) {
+                    pixels(i, other, c) = value;
+                } else {
+                    pixels(other, i, c) = value;
+                }
             }
         }
     }
+}
+
+// Two-pass separable Gaussian blur applied in place to a (width, height, channels)
+// uint8 pixel array, such as pygame.surfarray.pixels3d. Each pass is split
+// across threads with the GIL released.
+void apply_gaussian_blur(py::array_t<uint8_t> image, double sigma, int threads) {
+    if (image.ndim() != 3) {
+        throw std::invalid_argument("Image must be a (width, height, channels) array.");
+    }
+    if (sigma <= 0) {
+        throw std::invalid_argument("Sigma must be positive.");
+    }
+
+    auto pixels = image.mutable_unchecked<3>();
+    std::vector<int32_t> kernel = make_kernel(sigma, static_cast<int>(std::ceil(3 * sigma)));
 
-    return blurred_image;
+    if (threads <= 0) {
+        threads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+    }
+
+    py::gil_scoped_release release;
+    for (int axis = 0; axis < 2; ++axis) {
+        int lines = static_cast<int>(pixels.shape(1 - axis));
+        int workers = std::max(1, std::min(threads, lines));
+        std::vector<std::thread> pool;
+        for (int t = 1; t < workers; ++t) {
+            pool.emplace_back([&, t]() {
+                blur_lines(pixels, axis, lines * t / workers, lines * (t + 1) / workers, kernel);
+            });
+        }
+        blur_lines(pixels, axis, 0, lines / workers, kernel);
+        for (auto& thread : pool) {
+            thread.join();
+        }
+    }
 }
 
 
@@ -68,6 +117,6 @@ PYBIND11_MODULE(game_over_screen_ext, m) {
     m.def("wrap_text", &wrap_text, "Wrap text to fit within a specified width",
           py::arg("text"), py::arg("max_width"), py::arg("font_width"));
 
-    m.def("apply_gaussian_blur", &apply_gaussian_blur, "Apply Gaussian blur to an image",
-          py::arg("image"), py::arg("sigma"));
+    m.def("apply_gaussian_blur", &apply_gaussian_blur, "Apply a separable Gaussian blur to an image in place",
+          py::arg("image").noconvert(), py::arg("sigma"), py::arg("threads") = 0);
 }
@@ -2,26 +2,33 @@ import os
 import sys
 from typing import Optional, Any
 
-import numpy as np
 import pygame
 from pygame import Surface, Rect
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "ext")))
 import game_over_screen_ext
 
+from assets import asset_cache
+from scheduler import FrameScheduler
 from sound_manager import SoundManager
+from text_cache import text_cache
 
 
 class GameOverScreen:
     def __init__(self,
                  screen_size: tuple[int, int],
-                 captured_screen: Optional[pygame.Surface] = None
+                 captured_screen: Optional[pygame.Surface] = None,
+                 scheduler: Optional[FrameScheduler] = None,
+                 blur_downscale: int = 1
                  ) -> None:
         pygame.init()
         pygame.font.init()
 
-        self.screen = pygame.display.set_mode(screen_size)
-        self.sound_manager = SoundManager()
+        self.screen = pygame.display.get_surface()
+        if self.screen is None or self.screen.get_size() != tuple(screen_size):
+            self.screen = pygame.display.set_mode(screen_size)
+        self.sound_manager = SoundManager(preload=('game_over',))
+        self.scheduler = scheduler or FrameScheduler(max_fps=24)
         pygame.display.set_caption('Game Over')
 
         self.BLACK = (0, 0, 0)
@@ -33,13 +40,14 @@ class GameOverScreen:
 
         try:
             font_path = os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf')
-            self.font_large = pygame.font.Font(font_path, 50)
-            self.font_small = pygame.font.Font(font_path, 20)
+            self.font_large = asset_cache.font(font_path, 50)
+            self.font_small = asset_cache.font(font_path, 20)
         except Exception:
             self.font_large = pygame.font.SysFont('arial', 74)
             self.font_small = pygame.font.SysFont('arial', 36)
 
         self.screen_width, self.screen_height = screen_size
+        self.blur_downscale = max(1, blur_downscale)
 
         self.blurred_background = self.create_blurred_background(captured_screen)
 
@@ -47,15 +55,21 @@ class GameOverScreen:
         if captured_screen is None:
             raise ValueError("Captured screen is None. Ensure a valid screen surface is passed.")
 
-        screen_array = pygame.surfarray.array3d(captured_screen)
+        sigma = 2
+        surface = captured_screen.convert()
+        if self.blur_downscale > 1:
+            width, height = surface.get_size()
+            size = (max(1, width // self.blur_downscale), max(1, height // self.blur_downscale))
+            surface = pygame.transform.smoothscale(surface, size)
+            sigma = max(sigma / self.blur_downscale, 0.5)
 
-        image_list = screen_array.tolist()
+        pixels = pygame.surfarray.pixels3d(surface)
+        game_over_screen_ext.apply_gaussian_blur(pixels, sigma=sigma)
+        del pixels
 
-        blurred_list = game_over_screen_ext.apply_gaussian_blur(image_list, sigma=2)
-        blurred_array = np.array(blurred_list, dtype=np.uint8)
-        blurred_surface = pygame.surfarray.make_surface(blurred_array)
-
-        return pygame.transform.scale(blurred_surface, (self.screen_width, self.screen_height))
+        if surface.get_size() == (self.screen_width, self.screen_height):
+            return surface
+        return pygame.transform.smoothscale(surface, (self.screen_width, self.screen_height))
 
     def render_text_with_stroke(self,
                                 text: str,
@@ -64,15 +78,7 @@ class GameOverScreen:
                                 stroke_color: tuple[int, int, int],
                                 center: tuple[int, int]
                                 ) -> tuple[Surface, Rect]:
-        text_surface = font.render(text, True, color)
-
-        outline_surface = pygame.Surface(text_surface.get_size(), pygame.SRCALPHA)
-        for dx, dy in [(-2, 0), (2, 0), (0, -2), (0, 2), (-2, -2), (2, -2), (-2, 2), (2, 2)]:
-            offset_surface = font.render(text, True, stroke_color)
-            outline_surface.blit(offset_surface, (dx + 2, dy + 2))
-
-        outline_surface.blit(text_surface, (2, 2))
-
+        outline_surface = text_cache.render(font, text, color, stroke_color)
         rect = outline_surface.get_rect(center=center)
         return outline_surface, rect
 
@@ -90,56 +96,17 @@ class GameOverScreen:
         max_font_size = 50
         font_growth_rate = 1
 
-        running = True
-        while running:
-            if self.blurred_background:
-                self.screen.blit(self.blurred_background, (0, 0))
-            else:
-                self.screen.fill(self.BLACK)
-
-            if font_size < max_font_size:
-                font_size += font_growth_rate
-
-            if reason == 'win':
-                title = "VICTORY!"
-                title_color = self.GREEN
-                stroke_color = self.DARK_GREEN
-            else:
-                title = "GAME OVER"
-                title_color = self.RED
-                stroke_color = self.BLOOD_RED
-
-            temp_font = pygame.font.Font(os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf'), font_size)
-
-            game_over_surface, game_over_rect = self.render_text_with_stroke(
-                title, temp_font, title_color, stroke_color,
-                (self.screen_width // 2, self.screen_height // 2 - 100)
-            )
-            self.screen.blit(game_over_surface, game_over_rect)
-
-            if message and font_size >= max_font_size:
-                message_lines = self.wrap_text(message, self.font_small, self.screen_width - 40)
-                message_y = self.screen_height // 2 - 20
-                for line in message_lines:
-                    reason_surface, reason_rect = self.render_text_with_stroke(
-                        line, self.font_small, self.WHITE, self.BLACK,
-                        (self.screen_width // 2, message_y)
-                    )
-                    self.screen.blit(reason_surface, reason_rect)
-                    message_y += 30
-
-            if font_size >= max_font_size:
-                restart_surface, restart_rect = self.render_text_with_stroke(
-                    'Press R to Restart or ESC to Quit', self.font_small, self.WHITE, self.BLACK,
-                    (self.screen_width // 2, self.screen_height // 2 + 100)
-                )
-                self.screen.blit(restart_surface, restart_rect)
-
-            for event in pygame.event.get():
+        redraw = True
+        while True:
+            animating = font_size < max_font_size
+            for event in self.scheduler.wait(animating):
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    redraw = True
+
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r:
                         return 'restart'
@@ -147,6 +114,52 @@ class GameOverScreen:
                         pygame.quit()
                         sys.exit()
 
-            pygame.display.flip()
+            if animating and self.scheduler.frame_due:
+                font_size += font_growth_rate
+                redraw = True
+
+            if redraw:
+                self.draw_frame(reason, message, font_size, max_font_size)
+                pygame.display.flip()
+                redraw = False
+
+    def draw_frame(self, reason: str, message: str, font_size: int, max_font_size: int) -> None:
+        if self.blurred_background:
+            self.screen.blit(self.blurred_background, (0, 0))
+        else:
+            self.screen.fill(self.BLACK)
+
+        if reason == 'win':
+            title = "VICTORY!"
+            title_color = self.GREEN
+            stroke_color = self.DARK_GREEN
+        else:
+            title = "GAME OVER"
+            title_color = self.RED
+            stroke_color = self.BLOOD_RED
+
+        temp_font = asset_cache.font(os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf'), font_size)
+
+        game_over_surface, game_over_rect = self.render_text_with_stroke(
+            title, temp_font, title_color, stroke_color,
+            (self.screen_width // 2, self.screen_height // 2 - 100)
+        )
+        self.screen.blit(game_over_surface, game_over_rect)
+
+        if message and font_size >= max_font_size:
+            message_lines = self.wrap_text(message, self.font_small, self.screen_width - 40)
+            message_y = self.screen_height // 2 - 20
+            for line in message_lines:
+                reason_surface, reason_rect = self.render_text_with_stroke(
+                    line, self.font_small, self.WHITE, self.BLACK,
+                    (self.screen_width // 2, message_y)
+                )
+                self.screen.blit(reason_surface, reason_rect)
+                message_y += 30
 
-            pygame.time.Clock().tick(24)
+        if font_size >= max_font_size:
+            restart_surface, restart_rect = self.render_text_with_stroke(
+                'Press R to Restart or ESC to Quit', self.font_small, self.WHITE, self.BLACK,
+                (self.screen_width // 2, self.screen_height // 2 + 100)
+            )
+            self.screen.blit(restart_surface, restart_rect)
@@ -1,8 +1,17 @@
 import os
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 
+from assets import asset_cache
+from camera import Camera
 from game_config import GameConfig
-from models import Robot, Player, Key, Charge
+from engine import PlayerState
+from text_cache import GlyphAtlas
+
+
+CHUNK_CELLS = 16
 
 
 class GameRenderer:
@@ -23,129 +32,250 @@ class GameRenderer:
         self.charge_sprite = charge_sprite
         self.config = config
 
-        grid_settings = config.get_grid_settings()
         color_settings = config.get_color_settings()
-        textures = config.get_textures_settings()
-        gameplay_settings = config.get_gameplay_settings()
 
-        self.rows = grid_settings["rows"]
-        self.cols = grid_settings["cols"]
-        self.cell_size = grid_settings["cell_size"]
+        self.rows = config.rows
+        self.cols = config.cols
+        self.cell_size = config.cell_size
+        self.camera = Camera(self.rows, self.cols, config.viewport_rows, config.viewport_cols)
+        chunk_rows = -(-self.camera.view_rows // CHUNK_CELLS) + 1
+        chunk_cols = -(-self.camera.view_cols // CHUNK_CELLS) + 1
+        self.max_chunks = 4 * chunk_rows * chunk_cols
 
-        self.exit_pos = gameplay_settings["exit_position"]
+        self.exit_pos = config.exit_position
 
         self.exit_color = tuple(color_settings["exit"])
         self.stroke_color = color_settings['stroke']
         self.white = (255, 255, 255)
 
-        self.textures = textures
+        self.default_tile = config.get_textures_settings()["default"][0]
+        self.cleft_code = config.cell_codes["cleft"]
+        self.scrap_code = config.cell_codes["scrap"]
+        self.object_codes = config.object_codes
 
         self.difficulty = config.difficulty
 
+        self.scrap_sprite = pygame.transform.grayscale(robot_sprite)
+
+        pinged_robot_sprite = robot_sprite.copy()
+        pygame.draw.ellipse(pinged_robot_sprite, (0, 255, 255), pinged_robot_sprite.get_rect().inflate(-10, -10),
+                            width=2)
+        highlight_sprite = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        pygame.draw.rect(highlight_sprite, self.stroke_color, highlight_sprite.get_rect().inflate(-4, -4), width=2)
+        self.layer_sprites = {
+            'key': self.centered(key_sprite),
+            'charge': self.centered(charge_sprite),
+            'highlight': self.centered(highlight_sprite),
+            'player': self.centered(player_sprite),
+            'robot': self.centered(robot_sprite),
+            'pinged_robot': self.centered(pinged_robot_sprite),
+        }
+
         self.hud_charge_icon = pygame.transform.scale(charge_sprite, (30, 30))
         self.hud_key_icon = pygame.transform.scale(key_sprite, (30, 30))
 
         font_path = os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf')
-        self.font = pygame.font.Font(font_path, 20)
-
-    def draw_grid(self, game_map: list[list[str]]) -> None:
-        for row in range(self.rows):
-            for col in range(self.cols):
-                cell_value = game_map[row][col]
-                frame_index = self.get_frame_index(cell_value)
-                rect = pygame.Rect(
-                    col * self.cell_size,
-                    row * self.cell_size,
-                    self.cell_size,
-                    self.cell_size
-                )
-                self.screen.blit(self.tiles[frame_index], rect)
-
-    def get_frame_index(self, cell_value: str) -> pygame.Surface | int:
-        if cell_value == 'C':
-            return self.textures["default"][0]-1
-        elif cell_value in 'RGKPE':
-            return self.textures["default"][0]
-        elif cell_value.isdigit():
-            return int(cell_value)
+        self.font = asset_cache.font(font_path, 20)
+        self.hud_glyphs = GlyphAtlas(self.font, self.white)
+
+        self.hud_rect = pygame.Rect(10, 20, 230, 50)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self.baked_map = None
+        self.chunks = OrderedDict()
+        self.cell_contents = {}
+        self.hud_state = None
+        self.pending_cells = set()
+
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        self.pending_cells |= self.cells_in_rect(rect)
+
+    def cell_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect((col - self.camera.left) * self.cell_size, (row - self.camera.top) * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def local_rect(self, row: int, col: int) -> pygame.Rect:
+        return pygame.Rect(col % CHUNK_CELLS * self.cell_size, row % CHUNK_CELLS * self.cell_size,
+                           self.cell_size, self.cell_size)
+
+    def cells_in_rect(self, rect: pygame.Rect) -> set[tuple[int, int]]:
+        rows = range(max(rect.top // self.cell_size, 0),
+                     min((rect.bottom - 1) // self.cell_size + 1, self.camera.view_rows))
+        cols = range(max(rect.left // self.cell_size, 0),
+                     min((rect.right - 1) // self.cell_size + 1, self.camera.view_cols))
+        return {self.camera.to_world(row, col) for row in rows for col in cols}
+
+    def visible_chunks(self) -> list[tuple[int, int]]:
+        camera = self.camera
+        chunk_rows = range(camera.top // CHUNK_CELLS, (camera.top + camera.view_rows - 1) // CHUNK_CELLS + 1)
+        chunk_cols = range(camera.left // CHUNK_CELLS, (camera.left + camera.view_cols - 1) // CHUNK_CELLS + 1)
+        return [(chunk_row, chunk_col) for chunk_row in chunk_rows for chunk_col in chunk_cols]
+
+    def chunk_slices(self, chunk: tuple[int, int]) -> tuple[slice, slice]:
+        chunk_row, chunk_col = chunk
+        return (slice(chunk_row * CHUNK_CELLS, min((chunk_row + 1) * CHUNK_CELLS, self.rows)),
+                slice(chunk_col * CHUNK_CELLS, min((chunk_col + 1) * CHUNK_CELLS, self.cols)))
+
+    def bake_chunk(self, chunk: tuple[int, int], game_map: np.ndarray) -> None:
+        rows, cols = self.chunk_slices(chunk)
+        surface = pygame.Surface(((cols.stop - cols.start) * self.cell_size,
+                                  (rows.stop - rows.start) * self.cell_size)).convert()
+        surface.fill((0, 0, 0))
+        self.chunks[chunk] = surface
+
+        self.baked_map[rows, cols] = game_map[rows, cols]
+        cells = self.baked_map[rows, cols].tolist()
+        for row_offset, row_cells in enumerate(cells):
+            for col_offset, cell_value in enumerate(row_cells):
+                self.draw_terrain(rows.start + row_offset, cols.start + col_offset, cell_value)
+
+    def update_terrain(self, game_map: np.ndarray) -> set[tuple[int, int]]:
+        if self.baked_map is None or self.baked_map.shape != game_map.shape:
+            self.baked_map = game_map.copy()
+            self.chunks.clear()
+
+        changed = set()
+        for chunk in self.visible_chunks():
+            if chunk not in self.chunks:
+                self.bake_chunk(chunk, game_map)
+                continue
+
+            self.chunks.move_to_end(chunk)
+            rows, cols = self.chunk_slices(chunk)
+            for row, col in np.argwhere(game_map[rows, cols] != self.baked_map[rows, cols]).tolist():
+                row, col = row + rows.start, col + cols.start
+                self.baked_map[row, col] = game_map[row, col]
+                self.draw_terrain(row, col, int(game_map[row, col]))
+                changed.add((row, col))
+
+        while len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return changed
+
+    def draw_terrain(self, row: int, col: int, cell_value: int) -> None:
+        chunk = self.chunks[(row // CHUNK_CELLS, col // CHUNK_CELLS)]
+        rect = self.local_rect(row, col)
+        chunk.blit(self.tiles[self.get_frame_index(cell_value)], rect)
+        if (row, col) == self.exit_pos:
+            pygame.draw.rect(chunk, self.exit_color, rect)
+        if cell_value == self.scrap_code:
+            chunk.blit(self.scrap_sprite, rect)
+
+    def get_frame_index(self, cell_value: int) -> int:
+        if cell_value == self.cleft_code:
+            return self.default_tile-1
+        elif cell_value in self.object_codes or cell_value == self.scrap_code:
+            return self.default_tile
+        elif cell_value < len(self.tiles):
+            return cell_value
         else:
             raise ValueError(f"Unknown cell value: {cell_value}")
 
-    def draw_exit(self) -> None:
-        rect = pygame.Rect(
-            self.exit_pos[1] * self.cell_size,
-            self.exit_pos[0] * self.cell_size,
-            self.cell_size,
-            self.cell_size,
-        )
-        pygame.draw.rect(self.screen, self.exit_color, rect)
-
-    def draw_objects(self, objects: pygame.sprite.Group | list, sprite: pygame.Surface) -> None:
-        for obj in objects:
-            obj_rect = sprite.get_rect(
-                center=(
-                    obj.y * self.cell_size + self.cell_size // 2,
-                    obj.x * self.cell_size + self.cell_size // 2,
-                )
-            )
-            self.screen.blit(sprite, obj_rect)
-
-    def draw_highlight_stroke(self, cells: list[list[str]]) -> None:
-        for row, col in cells:
-            rect = pygame.Rect(
-                col * self.cell_size + 2,
-                row * self.cell_size + 2,
-                self.cell_size - 4,
-                self.cell_size - 4
-            )
-            pygame.draw.rect(self.screen, self.stroke_color, rect, width=2)
-
-    def draw_robot(self, robot: Robot) -> None:
-        robot_rect = self.robot_sprite.get_rect(
-            center=(
-                robot.y * self.cell_size + self.cell_size // 2,
-                robot.x * self.cell_size + self.cell_size // 2,
-            )
-        )
-        self.screen.blit(self.robot_sprite, robot_rect)
-        if robot.is_pinged:
-            pygame.draw.ellipse(self.screen, (0, 255, 255), robot_rect.inflate(-10, -10), width=2)
-
-    def draw_robots(self, robots: pygame.sprite.Group) -> None:
-        for robot in robots:
-            self.draw_robot(robot)
-
-    def draw_player(self, player: Player) -> None:
-        self.draw_objects([player], self.player_sprite)
-
-    def render_hud(self, player: Player) -> None:
-        hud_background_rect = pygame.Rect(10, 20, 230, 50)
+    def collect_cell_contents(self,
+                              keys: set[tuple[int, int]],
+                              charges: set[tuple[int, int]],
+                              player: PlayerState,
+                              robot_cells: dict[tuple[int, int], int],
+                              pinged: set[int],
+                              highlight_cells: list[tuple[int, int]]
+                              ) -> dict[tuple[int, int], list[str]]:
+        contents = {}
+        camera = self.camera
+        highlighted = set(highlight_cells)
+        player_cell = player.position()
+        for row in range(camera.top, camera.top + camera.view_rows):
+            for col in range(camera.left, camera.left + camera.view_cols):
+                cell = row, col
+                layers = []
+                if cell in keys:
+                    layers.append('key')
+                if cell in charges:
+                    layers.append('charge')
+                if cell in highlighted:
+                    layers.append('highlight')
+                if cell == player_cell:
+                    layers.append('player')
+                robot_id = robot_cells.get(cell)
+                if robot_id is not None:
+                    layers.append('pinged_robot' if robot_id in pinged else 'robot')
+                if layers:
+                    contents[cell] = layers
+        return contents
+
+    def centered(self, sprite: pygame.Surface) -> tuple[pygame.Surface, tuple[int, int]]:
+        cell = pygame.Rect(0, 0, self.cell_size, self.cell_size)
+        return sprite, sprite.get_rect(center=cell.center).topleft
+
+    def layer_blits(self, rect: pygame.Rect, layers: list[str]) -> list[tuple[pygame.Surface, tuple[int, int]]]:
+        blits = []
+        for layer in layers:
+            sprite, (dx, dy) = self.layer_sprites[layer]
+            blits.append((sprite, (rect.x + dx, rect.y + dy)))
+        return blits
+
+    def render_hud(self, player: PlayerState) -> None:
+        hud_background_rect = self.hud_rect
         pygame.draw.rect(self.screen, (0, 0, 0), hud_background_rect, border_radius=8)
         pygame.draw.rect(self.screen, self.white, hud_background_rect, width=2, border_radius=8)
 
         self.screen.blit(self.hud_charge_icon, (20, 28))
-        charge_text = self.font.render(f"x{player.charges}", True, self.white)
-        self.screen.blit(charge_text, (60, 33))
+        self.hud_glyphs.draw(self.screen, f"x{player.charges}", (60, 33))
 
         self.screen.blit(self.hud_key_icon, (140, 28))
-        key_text = self.font.render(f"x{player.keys}", True, self.white)
-        self.screen.blit(key_text, (180, 33))
+        self.hud_glyphs.draw(self.screen, f"x{player.keys}", (180, 33))
 
     def render(self,
-               game_map: list[list[str]],
-               keys: pygame.sprite.Group,
-               charges: pygame.sprite.Group,
-               player: Player,
-               robots: pygame.sprite.Group,
-               highlight_cells: list[list[str]]
+               game_map: np.ndarray,
+               keys: set[tuple[int, int]],
+               charges: set[tuple[int, int]],
+               player: PlayerState,
+               robot_cells: dict[tuple[int, int], int],
+               pinged: set[int],
+               highlight_cells: list[tuple[int, int]]
                ) -> None:
-        self.screen.fill((0, 0, 0))
-        self.draw_grid(game_map)
-        self.draw_exit()
-        self.draw_objects(keys, self.key_sprite)
-        self.draw_objects(charges, self.charge_sprite)
-        self.draw_highlight_stroke(highlight_cells)
-        self.draw_player(player)
-        self.draw_robots(robots)
-        self.render_hud(player)
-        pygame.display.flip()
+        full_redraw = self.camera.follow(player.x, player.y) or self.baked_map is None
+        dirty_cells = {cell for cell in self.update_terrain(game_map) if self.camera.contains(*cell)}
+        dirty_cells |= self.pending_cells
+        self.pending_cells = set()
+
+        contents = self.collect_cell_contents(keys, charges, player, robot_cells, pinged, highlight_cells)
+        for cell in contents.keys() | self.cell_contents.keys():
+            if contents.get(cell) != self.cell_contents.get(cell):
+                dirty_cells.add(cell)
+        self.cell_contents = contents
+
+        hud_state = (player.charges, player.keys)
+        hud_dirty = hud_state != self.hud_state
+        self.hud_state = hud_state
+
+        if full_redraw:
+            self.screen.fill((0, 0, 0))
+            blits = []
+            for chunk in self.visible_chunks():
+                rows, cols = self.chunk_slices(chunk)
+                blits.append((self.chunks[chunk], self.cell_rect(rows.start, cols.start)))
+            for (row, col), layers in contents.items():
+                blits.extend(self.layer_blits(self.cell_rect(row, col), layers))
+            self.screen.blits(blits, doreturn=False)
+            self.render_hud(player)
+            pygame.display.flip()
+            return
+
+        hud_cells = self.cells_in_rect(self.hud_rect)
+        if hud_dirty:
+            dirty_cells |= hud_cells
+        if not dirty_cells:
+            return
+
+        blits, rects = [], []
+        for row, col in dirty_cells:
+            rect = self.cell_rect(row, col)
+            blits.append((self.chunks[(row // CHUNK_CELLS, col // CHUNK_CELLS)], rect, self.local_rect(row, col)))
+            blits.extend(self.layer_blits(rect, contents.get((row, col), [])))
+            rects.append(rect)
+        self.screen.blits(blits, doreturn=False)
+        if not hud_cells.isdisjoint(dirty_cells):
+            self.render_hud(player)
+            rects.append(self.hud_rect)
+        pygame.display.update(rects)
@@ -0,0 +1,98 @@
+#pragma once
+
+#include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+#include <algorithm>
+#include <cstdint>
+#include <deque>
+#include <stdexcept>
+#include <vector>
+
+namespace py = pybind11;
+
+// The game map is a C-contiguous (rows, cols) uint8 array. Terrain cells hold
+// the tile index, everything else holds the ASCII code of its texture char.
+using Grid = py::array_t<uint8_t, py::array::c_style>;
+
+// Hazard masks have the map's shape; each cell holds these bits.
+constexpr uint8_t HAZARD_CLEFT = 1;
+constexpr uint8_t HAZARD_SCRAP = 2;
+
+constexpr int UNREACHABLE = -1;
+
+// Robots step four ways, the player eight; the first four steps are shared.
+enum Neighbourhood { FOUR_WAY = 4, EIGHT_WAY = 8 };
+
+struct GridView {
+    const uint8_t* cells;
+    int rows;
+    int cols;
+
+    explicit GridView(const Grid& grid) {
+        if (grid.ndim() != 2) {
+            throw std::invalid_argument("Game map must be a 2D grid.");
+        }
+        cells = grid.data();
+        rows = static_cast<int>(grid.shape(0));
+        cols = static_cast<int>(grid.shape(1));
+    }
+
+    bool contains(int x, int y) const {
+        return x >= 0 && x < rows && y >= 0 && y < cols;
+    }
+
+    uint8_t at(int x, int y) const {
+        return cells[x * cols + y];
+    }
+};
+
+// Breadth-first step counts from (x, y) over the hazard mask, skipping cells
+// with any of the `blocked` bits set. Cells that cannot reach (x, y) hold
+// UNREACHABLE.
+inline std::vector<int> distance_field(
+    int x, int y,
+    const GridView& hazards,
+    uint8_t blocked,
+    Neighbourhood neighbourhood
+) {
+    std::vector<int> distances(static_cast<size_t>(hazards.rows) * hazards.cols, UNREACHABLE);
+    if (!hazards.contains(x, y)) {
+        return distances;
+    }
+
+    static const int steps[8][2] = {{1, 0}, {-1, 0}, {0, 1}, {0, -1}, {1, 1}, {1, -1}, {-1, 1}, {-1, -1}};
+    std::deque<int> queue;
+    distances[x * hazards.cols + y] = 0;
+    queue.push_back(x * hazards.cols + y);
+
+    while (!queue.empty()) {
+        int cell = queue.front();
+        queue.pop_front();
+        int cx = cell / hazards.cols, cy = cell % hazards.cols;
+        for (int step = 0; step < neighbourhood; ++step) {
+            int nx = cx + steps[step][0], ny = cy + steps[step][1];
+            if (!hazards.contains(nx, ny)) {
+                continue;
+            }
+            int next = nx * hazards.cols + ny;
+            if (distances[next] == UNREACHABLE && (hazards.at(nx, ny) & blocked) == 0) {
+                distances[next] = distances[cell] + 1;
+                queue.push_back(next);
+            }
+        }
+    }
+    return distances;
+}
+
+inline py::array_t<int> distance_array(
+    int x, int y,
+    const Grid& hazards,
+    uint8_t blocked,
+    Neighbourhood neighbourhood
+) {
+    GridView grid(hazards);
+    std::vector<int> distances = distance_field(x, y, grid, blocked, neighbourhood);
+    py::array_t<int> result({grid.rows, grid.cols});
+    std::copy(distances.begin(), distances.end(), result.mutable_data());
+    return result;
+}
@@ -0,0 +1,30 @@
+import time
+
+started = time.perf_counter()
+
+import pygame
+
+from profiler import startup
+from start_menu import StartMenu
+
+
+def main() -> None:
+    startup.start(started)
+    startup.mark('import menu')
+
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    pygame.display.set_caption('Robot Battle')
+    startup.mark('window')
+
+    difficulty = StartMenu(screen).run()
+    startup.mark('difficulty selection', idle=True)
+
+    from game import Game
+    startup.mark('import game')
+
+    Game(difficulty=difficulty).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,18 @@
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <atomic>
+#include <optional>
 #include <random>
+#include <thread>
 #include <vector>
 #include <utility>
 #include <string>
 #include <cctype>
 #include <algorithm>
+#include <cmath>
+#include <stdexcept>
 
+#include "grid.hpp"
 
 namespace py = pybind11;
 
@@ -31,58 +37,190 @@ struct ConfigData {
 
 class MapGenerator {
 public:
-    static std::vector<std::vector<std::string>> generate_map(const ConfigData &cfg) {
-        std::vector<std::vector<std::string>> game_map(cfg.rows, std::vector<std::string>(cfg.cols, " "));
+    static constexpr int MAX_REROLLS = 16;
 
-        std::random_device rd;
-        std::mt19937 gen(rd());
-        std::uniform_int_distribution<> distr(0, (int)cfg.default_textures.size() - 1);
+    static Grid generate_map(const ConfigData &cfg, std::optional<uint64_t> seed) {
+        validate(cfg);
+        Grid game_map({cfg.rows, cfg.cols});
+        std::mt19937 gen = make_generator(seed);
+        fill_solvable_map(cfg, game_map.mutable_data(), gen);
+        return game_map;
+    }
 
-        for (int x = 0; x < cfg.rows; ++x) {
-            for (int y = 0; y < cfg.cols; ++y) {
-                int tex = cfg.default_textures[distr(gen)];
-                game_map[x][y] = std::to_string(tex);
+    static py::array_t<uint8_t> generate_maps(const ConfigData &cfg, const std::vector<uint64_t> &seeds, int threads) {
+        validate(cfg);
+        py::array_t<uint8_t> game_maps({static_cast<py::ssize_t>(seeds.size()),
+                                        static_cast<py::ssize_t>(cfg.rows),
+                                        static_cast<py::ssize_t>(cfg.cols)});
+        uint8_t *buffer = game_maps.mutable_data();
+        size_t map_size = static_cast<size_t>(cfg.rows) * cfg.cols;
+
+        if (threads <= 0) {
+            threads = static_cast<int>(std::max(1u, std::thread::hardware_concurrency()));
+        }
+        threads = std::min<int>(threads, std::max<size_t>(seeds.size(), 1));
+
+        py::gil_scoped_release release;
+        std::atomic<size_t> next{0};
+        auto worker = [&]() {
+            for (size_t i = next++; i < seeds.size(); i = next++) {
+                std::mt19937 gen = make_generator(seeds[i]);
+                fill_solvable_map(cfg, buffer + i * map_size, gen);
             }
+        };
+
+        std::vector<std::thread> pool;
+        for (int t = 1; t < threads; ++t) {
+            pool.emplace_back(worker);
         }
+        worker();
+        for (auto &thread : pool) {
+            thread.join();
+        }
+        return game_maps;
+    }
+
+    static std::mt19937 make_generator(std::optional<uint64_t> seed) {
+        if (!seed) {
+            std::random_device rd;
+            seed = (static_cast<uint64_t>(rd()) << 32) | rd();
+        }
+        std::seed_seq seq{static_cast<uint32_t>(*seed), static_cast<uint32_t>(*seed >> 32)};
+        return std::mt19937(seq);
+    }
 
-        init_object(cfg, game_map, std::string(1, cfg.cleft_char), cfg.clefts_coeff, true);
-        init_object(cfg, game_map, std::string(1, cfg.robot_char), cfg.initial_robots_coeff);
-        init_object(cfg, game_map, std::string(1, cfg.charge_char), cfg.charges_coeff);
-        init_object(cfg, game_map, std::string(1, cfg.key_char), cfg.key_coefficient);
+    static void fill_solvable_map(const ConfigData &cfg, uint8_t *game_map, std::mt19937 &gen) {
+        for (int attempt = 0; attempt < MAX_REROLLS; ++attempt) {
+            fill_map(cfg, game_map, gen);
+            if (is_solvable(cfg, game_map)) {
+                return;
+            }
+        }
+        repair(cfg, game_map);
+    }
 
-        game_map[cfg.player_pos.first][cfg.player_pos.second] = std::string(1, cfg.player_char);
-        game_map[cfg.exit_pos.first][cfg.exit_pos.second] = std::string(1, cfg.exit_char);
+    // Flood fills the non-cleft cells reachable from the player start (the
+    // player moves to any of the 8 neighbours) and checks that every key and
+    // the exit were reached.
+    static bool is_solvable(const ConfigData &cfg, const uint8_t *game_map) {
+        std::vector<uint64_t> reached = reachable_cells(cfg, game_map);
+        auto is_reached = [&](int cell) { return (reached[cell >> 6] >> (cell & 63)) & 1; };
 
-        return game_map;
+        if (!is_reached(cfg.exit_pos.first * cfg.cols + cfg.exit_pos.second)) {
+            return false;
+        }
+        for (int cell = 0; cell < cfg.rows * cfg.cols; ++cell) {
+            if (game_map[cell] == cfg.key_char && !is_reached(cell)) {
+                return false;
+            }
+        }
+        return true;
     }
 
+    static std::vector<uint64_t> reachable_cells(const ConfigData &cfg, const uint8_t *game_map) {
+        int total = cfg.rows * cfg.cols;
+        std::vector<uint64_t> open((total + 63) / 64, 0);
+        std::vector<uint64_t> reached(open.size(), 0);
+        for (int cell = 0; cell < total; ++cell) {
+            if (game_map[cell] != cfg.cleft_char) {
+                open[cell >> 6] |= uint64_t{1} << (cell & 63);
+            }
+        }
 
-static void init_object(const ConfigData &cfg, std::vector<std::vector<std::string>> &game_map, const std::string &obj, double coeff, bool check_cleft_spawn = false) {
-    int total_objects = static_cast<int>(std::round(cfg.rows * cfg.cols * coeff));
+        int start = cfg.player_pos.first * cfg.cols + cfg.player_pos.second;
+        if (!((open[start >> 6] >> (start & 63)) & 1)) {
+            return reached;
+        }
 
-    std::vector<std::pair<int, int>> empty_positions;
-    for (int x = 0; x < cfg.rows; ++x) {
-        for (int y = 0; y < cfg.cols; ++y) {
-            if (is_numeric(game_map[x][y])) {
-                if (check_cleft_spawn && obj == std::string(1, cfg.cleft_char) && !can_cleft_spawn(cfg, x, y)) {
-                    continue;
+        std::vector<int> stack = {start};
+        reached[start >> 6] |= uint64_t{1} << (start & 63);
+        while (!stack.empty()) {
+            int cell = stack.back();
+            stack.pop_back();
+            int x = cell / cfg.cols;
+            int y = cell % cfg.cols;
+            for (int dx = -1; dx <= 1; ++dx) {
+                for (int dy = -1; dy <= 1; ++dy) {
+                    int nx = x + dx;
+                    int ny = y + dy;
+                    if (nx < 0 || nx >= cfg.rows || ny < 0 || ny >= cfg.cols) {
+                        continue;
+                    }
+                    int next = nx * cfg.cols + ny;
+                    uint64_t bit = uint64_t{1} << (next & 63);
+                    if ((open[next >> 6] & bit) && !(reached[next >> 6] & bit)) {
+                        reached[next >> 6] |= bit;
+                        stack.push_back(next);
+                    }
                 }
-                empty_positions.emplace_back(x, y);
             }
         }
+        return reached;
     }
 
-    std::random_device rd;
-    std::mt19937 gen(rd());
-    std::shuffle(empty_positions.begin(), empty_positions.end(), gen);
+    // Clears the clefts on a straight 8-connected walk from the player start
+    // to the exit and to every key, which makes all of them reachable.
+    static void repair(const ConfigData &cfg, uint8_t *game_map) {
+        std::vector<std::pair<int, int>> targets = {cfg.exit_pos};
+        for (int cell = 0; cell < cfg.rows * cfg.cols; ++cell) {
+            if (game_map[cell] == cfg.key_char) {
+                targets.emplace_back(cell / cfg.cols, cell % cfg.cols);
+            }
+        }
 
-    for (int i = 0; i < std::min(total_objects, static_cast<int>(empty_positions.size())); ++i) {
-        int x = empty_positions[i].first;
-        int y = empty_positions[i].second;
-        game_map[x][y] = obj;
+        uint8_t floor = static_cast<uint8_t>(cfg.default_textures[0]);
+        for (const auto &[target_x, target_y] : targets) {
+            int x = cfg.player_pos.first;
+            int y = cfg.player_pos.second;
+            while (x != target_x || y != target_y) {
+                x += (target_x > x) - (target_x < x);
+                y += (target_y > y) - (target_y < y);
+                if (game_map[x * cfg.cols + y] == cfg.cleft_char) {
+                    game_map[x * cfg.cols + y] = floor;
+                }
+            }
+        }
     }
-}
 
+    static void fill_map(const ConfigData &cfg, uint8_t *game_map, std::mt19937 &gen) {
+        std::uniform_int_distribution<> distr(0, (int)cfg.default_textures.size() - 1);
+
+        for (int i = 0; i < cfg.rows * cfg.cols; ++i) {
+            game_map[i] = static_cast<uint8_t>(cfg.default_textures[distr(gen)]);
+        }
+
+        init_object(cfg, game_map, gen, cfg.cleft_char, cfg.clefts_coeff, true);
+        init_object(cfg, game_map, gen, cfg.robot_char, cfg.initial_robots_coeff);
+        init_object(cfg, game_map, gen, cfg.charge_char, cfg.charges_coeff);
+        init_object(cfg, game_map, gen, cfg.key_char, cfg.key_coefficient);
+
+        game_map[cfg.player_pos.first * cfg.cols + cfg.player_pos.second] = cfg.player_char;
+        game_map[cfg.exit_pos.first * cfg.cols + cfg.exit_pos.second] = cfg.exit_char;
+    }
+
+    static void init_object(const ConfigData &cfg, uint8_t *game_map, std::mt19937 &gen, char obj, double coeff, bool check_cleft_spawn = false) {
+        int total_objects = static_cast<int>(std::round(cfg.rows * cfg.cols * coeff));
+
+        std::vector<std::pair<int, int>> empty_positions;
+        for (int x = 0; x < cfg.rows; ++x) {
+            for (int y = 0; y < cfg.cols; ++y) {
+                if (is_terrain(cfg, game_map[x * cfg.cols + y])) {
+                    if (check_cleft_spawn && obj == cfg.cleft_char && !can_cleft_spawn(cfg, x, y)) {
+                        continue;
+                    }
+                    empty_positions.emplace_back(x, y);
+                }
+            }
+        }
+
+        std::shuffle(empty_positions.begin(), empty_positions.end(), gen);
+
+        for (int i = 0; i < std::min(total_objects, static_cast<int>(empty_positions.size())); ++i) {
+            int x = empty_positions[i].first;
+            int y = empty_positions[i].second;
+            game_map[x * cfg.cols + y] = obj;
+        }
+    }
 
     static bool can_cleft_spawn(const ConfigData &cfg, int x, int y) {
         std::vector<std::pair<int, int>> danger_zone = {
@@ -102,8 +240,29 @@ static void init_object(const ConfigData &cfg, std::vector<std::vector<std::stri
         return true;
     }
 
-    static bool is_numeric(const std::string &s) {
-        return !s.empty() && std::all_of(s.begin(), s.end(), ::isdigit);
+    static bool is_terrain(const ConfigData &cfg, uint8_t cell) {
+        return cell != cfg.cleft_char && cell != cfg.robot_char && cell != cfg.charge_char &&
+               cell != cfg.key_char && cell != cfg.player_char && cell != cfg.exit_char;
+    }
+
+    static void validate(const ConfigData &cfg) {
+        if (cfg.rows <= 0 || cfg.cols <= 0) {
+            throw std::invalid_argument("Map size must be positive.");
+        }
+        if (cfg.default_textures.empty()) {
+            throw std::invalid_argument("At least one default texture is required.");
+        }
+        for (int tex : cfg.default_textures) {
+            if (tex < 0 || tex > 255 || !is_terrain(cfg, static_cast<uint8_t>(tex))) {
+                throw std::invalid_argument("Texture index " + std::to_string(tex) + " collides with an object cell code.");
+            }
+        }
+        if (cfg.player_pos.first < 0 || cfg.player_pos.first >= cfg.rows ||
+            cfg.player_pos.second < 0 || cfg.player_pos.second >= cfg.cols ||
+            cfg.exit_pos.first < 0 || cfg.exit_pos.first >= cfg.rows ||
+            cfg.exit_pos.second < 0 || cfg.exit_pos.second >= cfg.cols) {
+            throw std::out_of_range("Player or exit position out of game map bounds.");
+        }
     }
 };
 
@@ -127,5 +286,21 @@ PYBIND11_MODULE(map_generator_ext, m) {
         .def_readwrite("player_char", &ConfigData::player_char)
         .def_readwrite("exit_char", &ConfigData::exit_char);
 
-    m.def("generate_map", &MapGenerator::generate_map, "Generate the game map");
+    m.def("generate_map", &MapGenerator::generate_map, "Generate the game map, randomly unless a seed is given",
+          py::arg("cfg"), py::arg("seed") = py::none());
+
+    m.def("is_solvable",
+          [](const ConfigData &cfg, const Grid &game_map) {
+              GridView grid(game_map);
+              if (grid.rows != cfg.rows || grid.cols != cfg.cols) {
+                  throw std::invalid_argument("Game map does not match the config size.");
+              }
+              return MapGenerator::is_solvable(cfg, grid.cells);
+          },
+          "Check that the exit and every key are reachable from the player start without crossing clefts",
+          py::arg("cfg"), py::arg("game_map").noconvert());
+
+    m.def("generate_maps", &MapGenerator::generate_maps,
+          "Generate one map per seed on a thread pool into a single (n, rows, cols) array",
+          py::arg("cfg"), py::arg("seeds"), py::arg("threads") = 0);
 }
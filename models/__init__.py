@@ -1,4 +1,3 @@
 from .charge import Charge
 from .key import Key
-from .player import Player
 from .robot import Robot
\ No newline at end of file
@@ -1,5 +1,4 @@
 import pygame
-import robot_core_ext
 
 class Robot(pygame.sprite.Sprite):
     def __init__(self,
@@ -20,20 +19,5 @@ class Robot(pygame.sprite.Sprite):
     def _update_rect_position(self) -> None:
         self.rect.topleft = (self.y * self.cell_size, self.x * self.cell_size)
 
-    def update(self, player, game_map: list[list[str]]) -> None:
-        player_x, player_y = player.x, player.y
-
-        cpp_game_map = [list(row) for row in game_map]
-
-        new_x, new_y, dead = robot_core_ext.update_robot(self.x, self.y, player_x, player_y, cpp_game_map)
-
-        self.x, self.y = new_x, new_y
-        self.is_pinged = False if dead else self.is_pinged
-        self._update_rect_position()
-
-    def is_dead(self, game_map: list[list[str]]) -> bool:
-        cpp_game_map = [list(row) for row in game_map]
-        return robot_core_ext.is_dead(self.x, self.y, cpp_game_map)
-
     def position(self) -> tuple[int, int]:
         return self.x, self.y
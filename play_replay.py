@@ -0,0 +1,79 @@
+import argparse
+import sys
+
+from engine import Action, GameEngine
+from game import Game
+from game_config import GameConfig
+from replay import Replay
+
+
+class ReplayPlayer:
+    def __init__(self, replay: Replay):
+        self.replay = replay
+
+    def __call__(self, engine: GameEngine) -> Action | None:
+        index = len(engine.recorder) if engine.recorder is not None else len(self.replay.actions)
+        if index >= len(self.replay.actions):
+            return None
+        return self.replay.actions[index]
+
+
+def simulate(replay: Replay, turn: int | None = None) -> GameEngine:
+    engine = GameEngine(GameConfig(difficulty=replay.difficulty))
+    engine.load_replay(replay, turn)
+    return engine
+
+
+def check(paths: list[str]) -> list[str]:
+    mismatches = []
+    for path in paths:
+        replay = Replay.load(path)
+        try:
+            engine = simulate(replay)
+        except ValueError as error:
+            mismatches.append(f"{path}: {error}")
+            continue
+        if (engine.outcome, engine.turn) != (replay.outcome, replay.turns):
+            mismatches.append(f"{path}: recorded {replay.outcome} on turn {replay.turns}, "
+                              f"replayed {engine.outcome} on turn {engine.turn}")
+    return mismatches
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect, play back and verify Robot Battle replays.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    simulate_parser = commands.add_parser('simulate', help="replay without rendering and print the final state")
+    simulate_parser.add_argument('path')
+    simulate_parser.add_argument('--turn', type=int, help="stop at the start of this turn")
+
+    play_parser = commands.add_parser('play', help="watch a replay")
+    play_parser.add_argument('path')
+    play_parser.add_argument('--turn', type=int, help="fast-forward to this turn before rendering")
+
+    check_parser = commands.add_parser('check', help="re-simulate replays and compare their recorded outcomes")
+    check_parser.add_argument('paths', nargs='+')
+
+    args = parser.parse_args(argv)
+
+    match args.command:
+        case 'simulate':
+            engine = simulate(Replay.load(args.path), args.turn)
+            print(f"turn {engine.turn}: outcome {engine.outcome}, player {engine.player.position()}, "
+                  f"charges {engine.player.charges}, keys {engine.player.keys}, robots {len(engine.robots)}")
+        case 'play':
+            replay = Replay.load(args.path)
+            game = Game(bot=ReplayPlayer(replay), difficulty=replay.difficulty)
+            game.load_replay(replay, args.turn)
+            game.run()
+        case 'check':
+            mismatches = check(args.paths)
+            for mismatch in mismatches:
+                print(mismatch)
+            print(f"{len(args.paths) - len(mismatches)}/{len(args.paths)} replays match")
+            return 1 if mismatches else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,21 +4,22 @@
 #include <tuple>
 #include <set>
 
+#include "grid.hpp"
+
 namespace py = pybind11;
 
-bool is_valid_move(int x, int y, const std::vector<std::vector<std::string>>& game_map) {
-    int rows = game_map.size();
-    int cols = rows > 0 ? game_map[0].size() : 0;
-    return x >= 0 && x < rows && y >= 0 && y < cols;
+bool is_valid_move(int x, int y, const Grid& game_map) {
+    return GridView(game_map).contains(x, y);
 }
 
-std::vector<std::tuple<int, int>> get_movable_cells(int player_x, int player_y, const std::vector<std::vector<std::string>>& game_map) {
+std::vector<std::tuple<int, int>> get_movable_cells(int player_x, int player_y, const Grid& game_map) {
+    GridView grid(game_map);
     std::vector<std::tuple<int, int>> cells;
     for (int dx = -1; dx <= 1; ++dx) {
         for (int dy = -1; dy <= 1; ++dy) {
             int new_x = player_x + dx;
             int new_y = player_y + dy;
-            if (is_valid_move(new_x, new_y, game_map)) {
+            if (grid.contains(new_x, new_y)) {
                 cells.emplace_back(new_x, new_y);
             }
         }
@@ -30,8 +31,9 @@ std::string move_player(int& player_x, int& player_y, int target_x, int target_y
                         const std::vector<std::tuple<int, int>>& robots,
                         std::vector<std::tuple<int, int>>& charges,
                         std::vector<std::tuple<int, int>>& keys,
-                        const std::vector<std::vector<std::string>>& game_map,
+                        const Grid& game_map, uint8_t cleft_code,
                         int& player_charges, int max_charges, int& player_keys) {
+    GridView grid(game_map);
     player_x = target_x;
     player_y = target_y;
 
@@ -41,7 +43,7 @@ std::string move_player(int& player_x, int& player_y, int target_x, int target_y
         }
     }
 
-    if (game_map[player_x][player_y] == "C") {
+    if (grid.at(player_x, player_y) == cleft_code) {
         return "cleft";
     }
 
@@ -68,13 +70,20 @@ std::string move_player(int& player_x, int& player_y, int target_x, int target_y
 
 PYBIND11_MODULE(player_core_ext, m) {
     m.def("is_valid_move", &is_valid_move, "Check if the move is valid",
-          py::arg("x"), py::arg("y"), py::arg("game_map"));
+          py::arg("x"), py::arg("y"), py::arg("game_map").noconvert());
 
     m.def("get_movable_cells", &get_movable_cells, "Get the list of valid cells the player can move to",
-          py::arg("player_x"), py::arg("player_y"), py::arg("game_map"));
+          py::arg("player_x"), py::arg("player_y"), py::arg("game_map").noconvert());
 
     m.def("move_player", &move_player, "Move the player and handle interactions",
           py::arg("player_x"), py::arg("player_y"), py::arg("target_x"), py::arg("target_y"),
-          py::arg("robots"), py::arg("charges"), py::arg("keys"), py::arg("game_map"),
-          py::arg("player_charges"), py::arg("max_charges"), py::arg("player_keys"));
+          py::arg("robots"), py::arg("charges"), py::arg("keys"), py::arg("game_map").noconvert(),
+          py::arg("cleft_code"), py::arg("player_charges"), py::arg("max_charges"), py::arg("player_keys"));
+
+    m.def("distance_field",
+          [](int x, int y, const Grid& hazards) {
+              return distance_array(x, y, hazards, HAZARD_CLEFT, EIGHT_WAY);
+          },
+          "Player moves needed to reach every cell from (x, y) without crossing a cleft (-1 where unreachable)",
+          py::arg("x"), py::arg("y"), py::arg("hazards").noconvert());
 }
@@ -0,0 +1,136 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import time
+from collections import defaultdict, deque
+from types import ModuleType
+from typing import Callable
+
+import pygame
+
+PROFILE_ENV = 'ROBOTBATTLE_PROFILE'
+PROFILE_OUTPUT_ENV = 'ROBOTBATTLE_PROFILE_OUTPUT'
+STARTUP_ENV = 'ROBOTBATTLE_STARTUP_REPORT'
+
+
+class PhaseProfiler:
+    def __init__(self, enabled: bool = False, window: int = 600):
+        self.enabled = enabled
+        self.window = window
+        self.samples = defaultdict(lambda: deque(maxlen=self.window))
+        self.instrumented = set()
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        self.samples[name].append(elapsed_ms)
+
+    def wrap(self, func: Callable, name: str) -> Callable:
+        if not self.enabled:
+            return func
+
+        samples = self.samples[name]
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append((perf_counter() - start) * 1000)
+        return timed
+
+    def instrument(self, obj: object, names: tuple[str, ...]) -> None:
+        for name in names:
+            setattr(obj, name, self.wrap(getattr(obj, name), name))
+
+    def instrument_module(self, module: ModuleType) -> None:
+        if not self.enabled or module.__name__ in self.instrumented:
+            return
+        self.instrumented.add(module.__name__)
+        for name, func in inspect.getmembers(module, inspect.isbuiltin):
+            setattr(module, name, self.wrap(func, f"{module.__name__}.{name}"))
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        stats = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats[name] = {
+                "count": len(ordered),
+                "p50": percentile(ordered, 50),
+                "p95": percentile(ordered, 95),
+                "p99": percentile(ordered, 99),
+            }
+        return stats
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.percentiles(), f, indent=2)
+
+    def draw_overlay(self, surface: pygame.Surface, font: pygame.font.Font) -> pygame.Rect:
+        lines = [f"{'phase':<28}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for name, stats in sorted(self.percentiles().items()):
+            lines.append(f"{name[-28:]:<28}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 10
+        rect = pygame.Rect(0, 0, width, line_height * len(lines) + 10)
+        rect.topright = (surface.get_width() - 10, 80)
+
+        overlay = pygame.Surface(rect.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        for index, line in enumerate(lines):
+            overlay.blit(font.render(line, True, (255, 255, 255)), (5, 5 + index * line_height))
+        surface.blit(overlay, rect)
+        return rect
+
+
+class StartupTimer:
+    def __init__(self, enabled: bool = False, origin: float | None = None):
+        self.enabled = enabled
+        self.start(time.perf_counter() if origin is None else origin)
+
+    def start(self, origin: float) -> None:
+        self.origin = self.last = origin
+        self.phases = []
+
+    def mark(self, phase: str, idle: bool = False) -> None:
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000, idle))
+        self.last = now
+
+    def total(self) -> float:
+        return sum(elapsed for _, elapsed, idle in self.phases if not idle)
+
+    def report(self) -> str:
+        lines = [f"{phase:<24}{elapsed:9.1f} ms{'  (not counted)' if idle else ''}"
+                 for phase, elapsed, idle in self.phases]
+        lines.append(f"{'total':<24}{self.total():9.1f} ms")
+        return '\n'.join(lines)
+
+    def print_report(self) -> None:
+        if self.enabled and self.phases:
+            print(self.report())
+
+
+def percentile(ordered: list[float], rank: int) -> float:
+    index = min(len(ordered) - 1, max(0, round(rank / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def create_profiler() -> PhaseProfiler:
+    if os.environ.get(PROFILE_ENV, '') in ('', '0'):
+        return PhaseProfiler()
+
+    profiler = PhaseProfiler(enabled=True)
+    output = os.environ.get(PROFILE_OUTPUT_ENV)
+    if output:
+        atexit.register(profiler.dump, output)
+    return profiler
+
+
+profiler = create_profiler()
+startup = StartupTimer(enabled=os.environ.get(STARTUP_ENV, '') not in ('', '0'))
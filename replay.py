@@ -0,0 +1,84 @@
+import struct
+
+MAGIC = b'RBRP'
+VERSION = 1
+HEADER = struct.Struct('<4sBQBIB')
+ACTION = struct.Struct('<BHH')
+
+ACTIONS = ('move', 'ping')
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+OUTCOMES = (None, 'win', 'robot', 'cleft')
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+
+
+class Replay:
+    __slots__ = ('difficulty', 'seed', 'actions', 'outcome', 'turns')
+
+    def __init__(self,
+                 difficulty: str,
+                 seed: int,
+                 actions: list[tuple[str, int, int]] | None = None,
+                 outcome: str | None = None,
+                 turns: int = 0):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.actions = actions or []
+        self.outcome = outcome
+        self.turns = turns
+
+    def to_bytes(self) -> bytes:
+        return encode(self.difficulty, self.seed, self.outcome, self.turns,
+                      b''.join(ACTION.pack(ACTION_CODES[action], row, col) for action, row, col in self.actions))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        if len(data) < HEADER.size:
+            raise ValueError("Truncated replay header")
+        magic, version, seed, outcome, turns, name_length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+
+        start = HEADER.size + name_length
+        difficulty = data[HEADER.size:start].decode('utf-8')
+        if (len(data) - start) % ACTION.size:
+            raise ValueError("Truncated replay action stream")
+        actions = [(ACTIONS[code], row, col) for code, row, col in ACTION.iter_unpack(data[start:])]
+        return cls(difficulty, seed, actions, OUTCOMES[outcome], turns)
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Replay':
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+
+class ReplayRecorder:
+    def __init__(self, difficulty: str, seed: int):
+        self.difficulty = difficulty
+        self.seed = seed
+        self.data = bytearray()
+
+    def record(self, action: str, row: int, col: int) -> None:
+        self.data += ACTION.pack(ACTION_CODES[action], row, col)
+
+    def to_bytes(self, outcome: str | None = None, turns: int = 0) -> bytes:
+        return encode(self.difficulty, self.seed, outcome, turns, self.data)
+
+    def replay(self, outcome: str | None = None, turns: int = 0) -> Replay:
+        return Replay.from_bytes(self.to_bytes(outcome, turns))
+
+    def __len__(self) -> int:
+        return len(self.data) // ACTION.size
+
+
+def encode(difficulty: str, seed: int, outcome: str | None, turns: int, actions: bytes) -> bytes:
+    name = difficulty.encode('utf-8')
+    return HEADER.pack(MAGIC, VERSION, seed, OUTCOME_CODES[outcome], turns, len(name)) + name + bytes(actions)
@@ -4,19 +4,22 @@
 #include <string>
 #include <utility>
 #include <tuple>
+#include <unordered_map>
+#include <array>
+#include <cstdlib>
+
+#include "grid.hpp"
 
 namespace py = pybind11;
 
-bool is_valid_move(int x, int y, const std::vector<std::vector<std::string>>& game_map) {
-    int rows = game_map.size();
-    int cols = game_map[0].size();
-    return x >= 0 && x < rows && y >= 0 && y < cols;
+bool is_valid_move(int x, int y, const GridView& grid) {
+    return grid.contains(x, y);
 }
 
 std::pair<int, int> move_towards(
     int robot_x, int robot_y,
     int player_x, int player_y,
-    const std::vector<std::vector<std::string>>& game_map
+    const GridView& grid
 ) {
     int dx = player_x - robot_x;
     int dy = player_y - robot_y;
@@ -25,12 +28,12 @@ std::pair<int, int> move_towards(
 
     if (abs(dx) > abs(dy)) {
         new_x = robot_x + (dx > 0 ? 1 : -1);
-        if (!is_valid_move(new_x, robot_y, game_map)) {
+        if (!is_valid_move(new_x, robot_y, grid)) {
             new_x = robot_x;
         }
     } else {
         new_y = robot_y + (dy > 0 ? 1 : -1);
-        if (!is_valid_move(robot_x, new_y, game_map)) {
+        if (!is_valid_move(robot_x, new_y, grid)) {
             new_y = robot_y;
         }
     }
@@ -38,27 +41,132 @@ std::pair<int, int> move_towards(
     return {new_x, new_y};
 }
 
-bool is_dead(int x, int y, const std::vector<std::vector<std::string>>& game_map) {
-    return game_map[x][y] == "C";
+bool is_dead(int x, int y, const GridView& hazards) {
+    return (hazards.at(x, y) & HAZARD_CLEFT) != 0;
 }
 
-std::tuple<int, int, bool> update_robot(
+enum RobotState { ACTIVE = 0, FELL = 1, WRECKED = 2 };
+enum RobotAI { GREEDY = 0, PATHFINDING = 1 };
+
+constexpr uint8_t ROBOT_BLOCKED = HAZARD_CLEFT | HAZARD_SCRAP;
+
+// Steps to the neighbour closest to the player on the distance field, trying
+// the axis with the larger gap first so open ground looks like the greedy
+// chase. Robots cut off from the player fall back to the greedy step.
+std::pair<int, int> move_downhill(
     int robot_x, int robot_y,
     int player_x, int player_y,
-    const std::vector<std::vector<std::string>>& game_map
+    const GridView& grid,
+    const std::vector<int>& distances
+) {
+    int current = grid.contains(robot_x, robot_y) ? distances[robot_x * grid.cols + robot_y] : UNREACHABLE;
+    if (current == UNREACHABLE) {
+        return move_towards(robot_x, robot_y, player_x, player_y, grid);
+    }
+
+    int dx = player_x - robot_x;
+    int dy = player_y - robot_y;
+    int sx = dx >= 0 ? 1 : -1;
+    int sy = dy >= 0 ? 1 : -1;
+    using Step = std::array<std::pair<int, int>, 4>;
+    Step steps = abs(dx) > abs(dy)
+        ? Step{{{sx, 0}, {0, sy}, {0, -sy}, {-sx, 0}}}
+        : Step{{{0, sy}, {sx, 0}, {-sx, 0}, {0, -sy}}};
+
+    std::pair<int, int> best{robot_x, robot_y};
+    int best_distance = current;
+    for (const auto& [step_x, step_y] : steps) {
+        int nx = robot_x + step_x, ny = robot_y + step_y;
+        if (!grid.contains(nx, ny)) {
+            continue;
+        }
+        int distance = distances[nx * grid.cols + ny];
+        if (distance != UNREACHABLE && distance < best_distance) {
+            best = {nx, ny};
+            best_distance = distance;
+        }
+    }
+    return best;
+}
+
+// Moves every robot one step, then resolves the turn in a single hashed
+// occupancy pass: robots that share a cell are wrecked, robots that run into
+// scrap are wrecked too. The caller leaves scrap on every wrecked robot's
+// cell. A robot that reaches the player's cell has caught the player and is
+// left alone.
+std::vector<std::tuple<int, int, int>> update_robots(
+    const std::vector<std::pair<int, int>>& robots,
+    int player_x, int player_y,
+    const Grid& hazards,
+    int ai
 ) {
-    auto [new_x, new_y] = move_towards(robot_x, robot_y, player_x, player_y, game_map);
-    bool dead = is_dead(new_x, new_y, game_map);
-    return {new_x, new_y, dead};
+    GridView grid(hazards);
+
+    std::vector<int> distances;
+    if (ai == PATHFINDING) {
+        distances = distance_field(player_x, player_y, grid, ROBOT_BLOCKED, FOUR_WAY);
+    } else if (ai != GREEDY) {
+        throw std::invalid_argument("Unknown robot AI: " + std::to_string(ai));
+    }
+
+    std::vector<std::tuple<int, int, int>> result;
+    result.reserve(robots.size());
+    std::unordered_map<int, int> occupancy;
+    occupancy.reserve(robots.size() * 2);
+
+    for (const auto& [robot_x, robot_y] : robots) {
+        auto [new_x, new_y] = ai == PATHFINDING
+            ? move_downhill(robot_x, robot_y, player_x, player_y, grid, distances)
+            : move_towards(robot_x, robot_y, player_x, player_y, grid);
+        int state = ACTIVE;
+        if (is_dead(new_x, new_y, grid)) {
+            state = FELL;
+        } else if ((grid.at(new_x, new_y) & HAZARD_SCRAP) && !(new_x == player_x && new_y == player_y)) {
+            state = WRECKED;
+        } else {
+            ++occupancy[new_x * grid.cols + new_y];
+        }
+        result.emplace_back(new_x, new_y, state);
+    }
+
+    int player_cell = player_x * grid.cols + player_y;
+    for (auto& [x, y, state] : result) {
+        int cell = x * grid.cols + y;
+        if (state == ACTIVE && cell != player_cell && occupancy[cell] > 1) {
+            state = WRECKED;
+        }
+    }
+
+    return result;
 }
 
 PYBIND11_MODULE(robot_core_ext, m) {
-    m.def("move_towards", &move_towards, "Move robot one step toward the player",
-          py::arg("robot_x"), py::arg("robot_y"), py::arg("player_x"), py::arg("player_y"), py::arg("game_map"));
+    m.def("move_towards",
+          [](int robot_x, int robot_y, int player_x, int player_y, const Grid& game_map) {
+              return move_towards(robot_x, robot_y, player_x, player_y, GridView(game_map));
+          },
+          "Move robot one step toward the player",
+          py::arg("robot_x"), py::arg("robot_y"), py::arg("player_x"), py::arg("player_y"),
+          py::arg("game_map").noconvert());
+
+    m.def("update_robots", &update_robots,
+          "Move all robots one step and report which fell into clefts or were wrecked",
+          py::arg("robots"), py::arg("player_x"), py::arg("player_y"), py::arg("hazards").noconvert(),
+          py::arg("ai") = static_cast<int>(GREEDY));
 
-    m.def("is_dead", &is_dead, "Check if the robot is dead (on a cleft)",
-          py::arg("x"), py::arg("y"), py::arg("game_map"));
+    m.def("distance_field",
+          [](int player_x, int player_y, const Grid& hazards) {
+              return distance_array(player_x, player_y, hazards, ROBOT_BLOCKED, FOUR_WAY);
+          },
+          "Distances from the player over cells robots can stand on (-1 where unreachable)",
+          py::arg("player_x"), py::arg("player_y"), py::arg("hazards").noconvert());
 
-    m.def("update_robot", &update_robot, "Update robot state",
-          py::arg("robot_x"), py::arg("robot_y"), py::arg("player_x"), py::arg("player_y"), py::arg("game_map"));
+    m.attr("ACTIVE") = static_cast<int>(ACTIVE);
+    m.attr("FELL") = static_cast<int>(FELL);
+    m.attr("WRECKED") = static_cast<int>(WRECKED);
+    m.attr("GREEDY") = static_cast<int>(GREEDY);
+    m.attr("PATHFINDING") = static_cast<int>(PATHFINDING);
+    m.attr("UNREACHABLE") = UNREACHABLE;
+    m.attr("HAZARD_CLEFT") = HAZARD_CLEFT;
+    m.attr("HAZARD_SCRAP") = HAZARD_SCRAP;
 }
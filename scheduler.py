@@ -0,0 +1,25 @@
+import pygame
+
+
+class FrameScheduler:
+    def __init__(self, max_fps: int = 60, power_save: bool = True):
+        self.max_fps = max_fps
+        self.power_save = power_save
+        self.frame_due = True
+        self.next_frame = 0
+
+    def wait(self, animating: bool = False) -> list[pygame.event.Event]:
+        if animating or not self.power_save:
+            timeout = self.next_frame - pygame.time.get_ticks()
+            event = pygame.event.wait(timeout) if timeout > 0 else pygame.event.poll()
+        else:
+            event = pygame.event.wait()
+
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+
+        now = pygame.time.get_ticks()
+        self.frame_due = now >= self.next_frame
+        if self.frame_due:
+            self.next_frame = now + 1000 // self.max_fps
+        return events
@@ -0,0 +1,100 @@
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from replay import OUTCOMES, OUTCOME_CODES
+
+MAGIC = b'RBSS'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQHHHHHHBBIIIIBd')
+RNG_WORDS = 625
+
+ROBOT = np.dtype([('id', '<u4'), ('row', '<u2'), ('col', '<u2'), ('pinged', 'u1')])
+CELL = np.dtype([('row', '<u2'), ('col', '<u2')])
+
+
+class Snapshot:
+    __slots__ = ('difficulty', 'state', 'rng_state')
+
+    def __init__(self, difficulty: str, state: dict, rng_state: tuple):
+        self.difficulty = difficulty
+        self.state = state
+        self.rng_state = rng_state
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'Snapshot':
+        if len(buffer) < HEADER.size:
+            raise ValueError("Truncated snapshot header")
+        (magic, version, name_length, seed, rows, cols, x, y, player_charges, player_keys, player_turn, outcome,
+         turn, robot_count, charge_count, key_count, has_gauss, gauss) = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a snapshot file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+
+        offset = HEADER.size + name_length
+        sizes = (RNG_WORDS * 4, rows * cols, robot_count * ROBOT.itemsize,
+                 charge_count * CELL.itemsize, key_count * CELL.itemsize)
+        if len(buffer) != offset + sum(sizes):
+            raise ValueError("Snapshot size does not match its header")
+        difficulty = bytes(buffer[HEADER.size:offset]).decode('utf-8')
+
+        rng = np.frombuffer(buffer, '<u4', RNG_WORDS, offset)
+        offset += sizes[0]
+        game_map = np.frombuffer(buffer, np.uint8, rows * cols, offset).reshape(rows, cols)
+        offset += sizes[1]
+        robots = np.frombuffer(buffer, ROBOT, robot_count, offset)
+        offset += sizes[2]
+        charges = np.frombuffer(buffer, CELL, charge_count, offset)
+        offset += sizes[3]
+        keys = np.frombuffer(buffer, CELL, key_count, offset)
+
+        state = {
+            'seed': seed,
+            'map': game_map,
+            'robots': {robot_id: (row, col) for robot_id, row, col, _ in robots.tolist()},
+            'pinged': set(robots['id'][robots['pinged'] != 0].tolist()),
+            'charges': set(charges.tolist()),
+            'keys': set(keys.tolist()),
+            'player': (x, y, player_charges, player_keys),
+            'player_turn': bool(player_turn),
+            'outcome': OUTCOMES[outcome],
+            'turn': turn,
+        }
+        rng_state = (3, tuple(rng.tolist()), gauss if has_gauss else None)
+        return cls(difficulty, state, rng_state)
+
+    @classmethod
+    def load(cls, path: str) -> 'Snapshot':
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            snapshot = cls.from_buffer(buffer)
+            snapshot.state['map'] = snapshot.state['map'].copy()
+            return snapshot
+
+
+def encode(difficulty: str, state: dict, rng_state: tuple) -> bytes:
+    name = difficulty.encode('utf-8')
+    game_map = np.ascontiguousarray(state['map'], dtype=np.uint8)
+    rows, cols = game_map.shape
+    x, y, player_charges, player_keys = state['player']
+    _, words, gauss = rng_state
+
+    robots = np.array([(robot_id, row, col, robot_id in state['pinged'])
+                       for robot_id, (row, col) in state['robots'].items()], dtype=ROBOT)
+    charges = np.array(sorted(state['charges']), dtype=CELL)
+    keys = np.array(sorted(state['keys']), dtype=CELL)
+
+    header = HEADER.pack(MAGIC, VERSION, len(name), state['seed'], rows, cols, x, y, player_charges, player_keys,
+                         state['player_turn'], OUTCOME_CODES[state['outcome']], state['turn'],
+                         len(robots), len(charges), len(keys), gauss is not None, gauss or 0.0)
+    return b''.join((header, name, np.array(words, dtype='<u4').tobytes(), game_map.tobytes(),
+                     robots.tobytes(), charges.tobytes(), keys.tobytes()))
+
+
+def save(data: bytes, path: str) -> None:
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
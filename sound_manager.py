@@ -1,29 +1,43 @@
 import pygame
 
+from assets import asset_cache
+
+SOUNDS = {
+    'click': 'assets/sounds/click3.wav',
+    # 'ping': 'assets/sounds/ping.wav',
+    'move': 'assets/sounds/move.wav',
+    'collect_key': 'assets/sounds/collect_item.wav',
+    'collect_charge': 'assets/sounds/collect_item.wav',
+    # 'robot_death': 'assets/sounds/robot_death.wav',
+    'game_over': 'assets/sounds/game_over.wav',
+}
+
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, preload: tuple[str, ...] | None = None):
         pygame.mixer.init()
 
-        self.sounds = {
-            'click': self.load_sound('assets/sounds/click3.wav'),
-            # 'ping': self.load_sound('assets/sounds/ping.wav'),
-            'move': self.load_sound('assets/sounds/move.wav'),
-            'collect_key': self.load_sound('assets/sounds/collect_item.wav'),
-            'collect_charge': self.load_sound('assets/sounds/collect_item.wav'),
-            # 'robot_death': self.load_sound('assets/sounds/robot_death.wav'),
-            'game_over': self.load_sound('assets/sounds/game_over.wav')
-        }
+        self.sounds = {}
+        self.preload(SOUNDS if preload is None else preload)
+
+    def preload(self, names=SOUNDS) -> None:
+        for name in names:
+            self.get(name)
+
+    def get(self, sound_name):
+        if sound_name not in self.sounds and sound_name in SOUNDS:
+            self.sounds[sound_name] = self.load_sound(SOUNDS[sound_name])
+        return self.sounds.get(sound_name)
 
     def load_sound(self, path):
         try:
-            return pygame.mixer.Sound(path)
+            return asset_cache.sound(path)
         except pygame.error:
             print(f"Warning: Could not load sound {path}")
             return None
 
     def play(self, sound_name, volume=0.5):
-        sound = self.sounds.get(sound_name)
+        sound = self.get(sound_name)
         if sound:
             sound.set_volume(volume)
-            sound.play()
\ No newline at end of file
+            sound.play()
@@ -3,32 +3,36 @@ import sys
 
 import pygame
 
+from assets import asset_cache
+from profiler import startup
+from scheduler import FrameScheduler
 from sound_manager import SoundManager
+from text_cache import text_cache
 
 
 class StartMenu:
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, scheduler: FrameScheduler | None = None):
         pygame.init()
         pygame.font.init()
 
         self.screen = screen
 
         try:
-            self.background_image = pygame.image.load('assets/background.png').convert()
-            self.background_image = pygame.transform.scale(self.background_image, self.screen.get_size())
+            self.background_image = asset_cache.image('assets/background.png', self.screen.get_size())
         except Exception:
             self.background_image = pygame.Surface(self.screen.get_size())
             self.background_image.fill((0, 0, 0))
 
-        self.sound_manager = SoundManager()
+        self.sound_manager = SoundManager(preload=('click',))
+        self.scheduler = scheduler or FrameScheduler(max_fps=30)
 
         self.WHITE = (255, 255, 255)
         self.HIGHLIGHT = (255, 223, 0)
 
         try:
             font_path = os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf')
-            self.title_font = pygame.font.Font(font_path, 40)
-            self.option_font = pygame.font.Font(font_path, 30)
+            self.title_font = asset_cache.font(font_path, 40)
+            self.option_font = asset_cache.font(font_path, 30)
         except Exception:
             self.title_font = pygame.font.SysFont('arial', 40)
             self.option_font = pygame.font.SysFont('arial', 30)
@@ -39,34 +43,35 @@ class StartMenu:
     def render_menu(self) -> None:
         self.screen.blit(self.background_image, (0, 0))
 
-        title_text = self.title_font.render("Select Difficulty", True, self.WHITE)
+        title_text = text_cache.render(self.title_font, "Select Difficulty", self.WHITE)
         title_rect = title_text.get_rect(center=(self.screen.get_width() // 2, 150))
         self.screen.blit(title_text, title_rect)
 
         for index, option in enumerate(self.options):
             color = self.HIGHLIGHT if index == self.selected_index else self.WHITE
-            option_text = self.option_font.render(f"• {option}", True, color)
+            option_text = text_cache.render(self.option_font, f"• {option}", color)
             option_rect = option_text.get_rect(center=(self.screen.get_width() // 2, 250 + index * 50))
             self.screen.blit(option_text, option_rect)
 
         pygame.display.flip()
 
     def run(self) -> str:
-        running = True
+        self.render_menu()
+        startup.mark('start menu')
 
-        while running:
-            self.render_menu()
-
-            for event in pygame.event.get():
+        while True:
+            for event in self.scheduler.wait():
                 if event.type == pygame.QUIT:
                     pygame.quit()
                     sys.exit()
 
+                if event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                    self.render_menu()
+
                 if event.type == pygame.KEYDOWN:
                     self.sound_manager.play('click', 0.1)
                     match event.key:
                         case pygame.K_UP: self.selected_index = (self.selected_index - 1) % len(self.options)
                         case pygame.K_DOWN: self.selected_index = (self.selected_index + 1) % len(self.options)
                         case pygame.K_RETURN: return self.options[self.selected_index].lower()
-
-            pygame.time.Clock().tick(30)
\ No newline at end of file
+                    self.render_menu()
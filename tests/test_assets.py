@@ -0,0 +1,58 @@
+import pygame
+import pytest
+
+from assets import AssetCache
+
+
+@pytest.fixture(scope="function")
+def init_pygame():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+
+def test_sprite_is_loaded_once_per_size(init_pygame, tmp_path, mocker):
+    image_path = tmp_path / "sprite.png"
+    pygame.image.save(pygame.Surface((50, 50)), image_path)
+    cache = AssetCache()
+    load = mocker.spy(pygame.image, "load")
+
+    first = cache.sprite(str(image_path), 32)
+    second = cache.sprite(str(image_path), 32)
+    other = cache.sprite(str(image_path), 16)
+
+    assert first is second
+    assert other.get_size() == (16, 16)
+    assert load.call_count == 2
+
+
+def test_evict_drops_every_variant_of_a_path(init_pygame, tmp_path):
+    image_path = str(tmp_path / "sprite.png")
+    pygame.image.save(pygame.Surface((50, 50)), image_path)
+    cache = AssetCache()
+    cache.preload(sprites=((image_path, 32), (image_path, 16)))
+    assert len(cache) == 2
+
+    cache.evict(image_path)
+    assert len(cache) == 0
+
+
+def test_failed_load_is_not_cached(init_pygame):
+    cache = AssetCache()
+    with pytest.raises(FileNotFoundError):
+        cache.sprite("invalid_path.png", 32)
+    assert len(cache) == 0
+
+
+def test_cache_is_cleared_on_pygame_quit(tmp_path):
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    image_path = str(tmp_path / "sprite.png")
+    pygame.image.save(pygame.Surface((8, 8)), image_path)
+    cache = AssetCache()
+    cache.sprite(image_path, 8)
+
+    pygame.quit()
+
+    assert len(cache) == 0
@@ -0,0 +1,74 @@
+import os
+import shutil
+
+import pygame
+import pytest
+
+from atlas import SPRITES, TILE_SHEET, TILE_SIZE, SpriteAtlas, load_atlas
+from utils import load_sprite, load_sprite_sheet
+
+
+@pytest.fixture
+def init_pygame():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def sources(tmp_path):
+    tile_sheet = str(tmp_path / 'tiles.png')
+    shutil.copy(TILE_SHEET, tile_sheet)
+    sprites = {}
+    for name, path in SPRITES.items():
+        sprites[name] = str(tmp_path / os.path.basename(path))
+        shutil.copy(path, sprites[name])
+    return tile_sheet, sprites
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, 'RGBA')
+
+
+def test_atlas_packs_tiles_and_sprites(init_pygame):
+    atlas = SpriteAtlas.build(TILE_SIZE)
+
+    tiles = load_sprite_sheet(TILE_SHEET, TILE_SIZE, TILE_SIZE)
+    assert len(atlas.tiles) == len(tiles)
+    assert all(pixels(packed) == pixels(tile) for packed, tile in zip(atlas.tiles, tiles))
+    assert pixels(atlas.sprites['robot']) == pixels(load_sprite(SPRITES['robot'], TILE_SIZE))
+    assert all(tile.get_parent() is atlas.surface for tile in atlas.tiles)
+
+
+def test_atlas_scales_tiles_to_cell_size(init_pygame):
+    atlas = SpriteAtlas.build(20)
+
+    assert {tile.get_size() for tile in atlas.tiles} == {(20, 20)}
+    assert atlas.sprites['key'].get_size() == (20, 20)
+
+
+def test_cached_atlas_skips_image_decoding(init_pygame, sources, tmp_path, mocker):
+    tile_sheet, sprites = sources
+    cache_dir = str(tmp_path / 'cache')
+    built = load_atlas(32, cache_dir, tile_sheet, sprites)
+    load = mocker.spy(pygame.image, 'load')
+
+    cached = load_atlas(32, cache_dir, tile_sheet, sprites)
+
+    load.assert_not_called()
+    assert pixels(cached.surface) == pixels(built.surface)
+    assert cached.regions == built.regions
+
+
+def test_changed_source_rebuilds_atlas(init_pygame, sources, tmp_path, mocker):
+    tile_sheet, sprites = sources
+    cache_dir = str(tmp_path / 'cache')
+    load_atlas(32, cache_dir, tile_sheet, sprites)
+    stat = os.stat(sprites['key'])
+    os.utime(sprites['key'], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    load = mocker.spy(pygame.image, 'load')
+
+    load_atlas(32, cache_dir, tile_sheet, sprites)
+
+    assert load.call_count == 1 + len(sprites)
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import benchmark
+
+
+def test_run_reports_every_phase():
+    report = benchmark.run(['11x18'], ['normal'], repeat=1, seed=3)
+
+    case = report["results"]["normal/11x18"]
+    for name in ('generate_map', 'convert_map', 'update_robots', 'play_turn',
+                 'render_full', 'render_incremental', 'blur'):
+        assert case[name]["median_ms"] >= 0
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"results": {"easy/11x18": {"blur": {"median_ms": 10.0}, "render_full": {"median_ms": 2.0},
+                                           "robots": 4}}}
+    current = {"results": {"easy/11x18": {"blur": {"median_ms": 12.0}, "render_full": {"median_ms": 3.0},
+                                          "robots": 4}}}
+
+    regressions = benchmark.compare(current, baseline, tolerance=0.25)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("easy/11x18 render_full")
+
+
+def test_main_fails_on_regression(tmp_path, mocker):
+    report = {"meta": {}, "results": {"easy/11x18": {"blur": {"median_ms": 20.0, "min_ms": 20.0}}}}
+    mocker.patch('benchmark.run', return_value=report)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"results": {"easy/11x18": {"blur": {"median_ms": 10.0}}}}')
+
+    assert benchmark.main(['--baseline', str(baseline)]) == 1
+    assert benchmark.main(['--baseline', str(baseline), '--tolerance', '1.5']) == 0
@@ -0,0 +1,90 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import player_core_ext
+import pytest
+
+from bot import MCTSBot, candidate_actions, play_game, search
+from engine import GameEngine
+from game_config import GameConfig
+
+
+def make_map(rows: list[str]) -> np.ndarray:
+    return np.array([[1 if cell == '.' else ord(cell) for cell in row] for row in rows], dtype=np.uint8)
+
+
+@pytest.fixture
+def engine():
+    return GameEngine(GameConfig(difficulty='normal'), seed=1)
+
+
+def test_candidate_actions_skip_clefts_and_live_robots(engine):
+    engine.load_map(make_map([
+        "C.R",
+        ".P.",
+        "...",
+    ]))
+
+    actions = candidate_actions(engine)
+
+    assert ('move', 0, 0) not in actions
+    assert ('move', 0, 2) not in actions
+    assert ('ping', 0, 2) in actions
+    assert ('move', 1, 1) in actions
+
+
+def test_player_distance_field_moves_diagonally_around_clefts(engine):
+    engine.load_map(make_map([
+        "P.C.",
+        "..C.",
+        "S...",
+    ]))
+
+    distances = player_core_ext.distance_field(0, 0, engine.hazards)
+
+    assert distances[2, 0] == 2
+    assert distances[0, 3] == 4
+    assert distances[0, 2] == -1
+
+
+def test_search_spends_exactly_the_iteration_budget(engine):
+    visits = search(engine, iterations=50)
+
+    assert sum(visits.values()) == 50
+
+
+def test_search_requires_a_budget(engine):
+    with pytest.raises(ValueError):
+        search(engine, iterations=None, time_budget=None)
+
+
+def test_bot_walks_to_the_exit_with_enough_keys(engine):
+    engine.load_map(make_map([
+        "E.....",
+        "......",
+        "....KP",
+    ]))
+    engine.exit_pos = (0, 0)
+    engine.number_of_keys = 1
+
+    outcome = engine.play(MCTSBot(iterations=60, seed=2), max_turns=20)
+
+    assert outcome == 'win'
+
+
+def test_parallel_search_merges_worker_visits(engine):
+    with MCTSBot(iterations=40, workers=2, seed=3) as bot:
+        action = bot(engine)
+
+    assert action in engine.legal_actions()
+
+
+def test_play_game_reports_outcome():
+    result = play_game(GameConfig(difficulty='easy'), seed=5, max_turns=5, iterations=10)
+
+    assert result['outcome'] in ('win', 'robot', 'cleft', 'timeout')
+    assert result['turns'] <= 5
@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+from calibrate import calibrate, parse_sweep, wilson_interval, write_back
+
+
+def test_parse_sweep_converts_values():
+    sweep = parse_sweep(['clefts_coefficient=0.1,0.2', 'max_charges=3'])
+
+    assert sweep == {'clefts_coefficient': [0.1, 0.2], 'max_charges': [3]}
+
+
+def test_parse_sweep_rejects_settings_the_game_ignores():
+    with pytest.raises(ValueError):
+        parse_sweep(['robots_coefficient=0.5'])
+
+
+def test_wilson_interval_brackets_the_rate():
+    low, high = wilson_interval(30, 100)
+
+    assert low < 0.3 < high
+    assert wilson_interval(0, 50)[0] == 0.0
+
+
+def test_calibrate_reports_every_setting():
+    results = calibrate('easy', {'max_charges': [1, 7]}, games=12, workers=1, chunk_size=5)
+
+    assert [result['settings'] for result in results] == [{'max_charges': 1}, {'max_charges': 7}]
+    for result in results:
+        assert result['games'] == 12
+        assert sum(result[outcome]['rate'] for outcome in ('win', 'robot', 'cleft', 'timeout')) == pytest.approx(1)
+
+
+def test_write_back_updates_only_the_difficulty(tmp_path):
+    path = tmp_path / 'difficulties.json'
+    path.write_text(json.dumps({'easy': {'max_charges': 7}, 'hard': {'max_charges': 3}}))
+
+    write_back('easy', {'max_charges': 5}, str(path))
+
+    assert json.loads(path.read_text()) == {'easy': {'max_charges': 5}, 'hard': {'max_charges': 3}}
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from camera import Camera
+
+
+def test_camera_covering_the_map_never_scrolls():
+    camera = Camera(11, 18, 11, 18)
+
+    assert not camera.follow(5, 17)
+    assert not camera.follow(0, 0)
+    assert (camera.top, camera.left) == (0, 0)
+
+
+def test_camera_centres_on_player_and_clamps_to_map():
+    camera = Camera(500, 500, 11, 18)
+
+    assert camera.follow(250, 250)
+    assert (camera.top, camera.left) == (245, 241)
+
+    camera.follow(499, 499)
+    assert (camera.top, camera.left) == (489, 482)
+
+
+def test_camera_stays_put_inside_margin():
+    camera = Camera(500, 500, 11, 18)
+    camera.follow(250, 250)
+
+    assert not camera.follow(251, 252)
+    assert camera.follow(250, 260)
+
+
+def test_to_world_offsets_screen_cells():
+    camera = Camera(500, 500, 11, 18)
+    camera.follow(250, 250)
+
+    assert camera.to_world(0, 0) == (245, 241)
+    assert camera.contains(245, 241)
+    assert not camera.contains(256, 241)
@@ -0,0 +1,297 @@
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+import robot_core_ext
+
+from engine import HAZARD_CLEFT, HAZARD_SCRAP, GameEngine
+from game_config import GameConfig
+
+
+def make_map(rows: list[str]) -> np.ndarray:
+    return np.array([[1 if cell == '.' else ord(cell) for cell in row] for row in rows], dtype=np.uint8)
+
+
+@pytest.fixture
+def engine():
+    return GameEngine(GameConfig(difficulty='normal'))
+
+
+def test_reset_populates_entities(engine):
+    rows = engine.game_config.get_grid_settings()["rows"]
+    cols = engine.game_config.get_grid_settings()["cols"]
+
+    assert engine.map.shape == (rows, cols) and engine.map.dtype == np.uint8
+    assert engine.player.position() == tuple(engine.game_config.get_gameplay_settings()["player_start_position"])
+    assert 0 < len(engine.keys) <= engine.number_of_keys
+    assert engine.player_turn is True
+    assert engine.outcome is None
+
+
+def test_reset_with_seed_reproduces_map(engine):
+    engine.reset(seed=7)
+    game_map = engine.map.copy()
+    engine.reset()
+    engine.reset(seed=7)
+
+    assert engine.seed == 7
+    assert np.array_equal(engine.map, game_map)
+
+
+def test_reset_leaves_the_shared_config_untouched():
+    config = GameConfig.load('normal')
+    first, second = GameEngine(config), GameEngine(config)
+    first.reset(seed=7)
+    game_map = first.map.copy()
+    second.reset(seed=8)
+    first.reset(seed=7)
+
+    assert not hasattr(config.cfg_data, 'seed')
+    assert np.array_equal(first.map, game_map)
+
+
+def test_move_collects_items_and_hands_turn_to_robots(engine):
+    engine.load_map(make_map([
+        ".....",
+        ".PK..",
+        "..G..",
+        ".....",
+    ]))
+    engine.player.charges = 0
+
+    assert engine.move(1, 2) is True
+    assert engine.player.keys == 1 and not engine.keys
+    assert engine.player_turn is False
+    assert engine.move(2, 2) is False
+
+    engine.move_robots()
+    assert engine.player_turn is True and engine.turn == 1
+
+    engine.move(2, 2)
+    assert engine.player.charges == 1 and not engine.charges
+
+
+def test_robots_chase_and_catch_player(engine):
+    engine.load_map(make_map([
+        "P...R",
+    ]))
+
+    assert engine.apply('move', 0, 0) is True
+    assert engine.robots == {0: (0, 3)}
+    engine.apply('move', 0, 1)
+    assert engine.robots == {0: (0, 2)}
+    assert engine.outcome is None
+    engine.apply('move', 0, 1)
+    assert engine.outcome == 'robot'
+
+
+def test_robot_falls_into_cleft(engine):
+    engine.load_map(make_map([
+        "P.CR",
+    ]))
+
+    engine.apply('move', 0, 0)
+    assert engine.robots == {}
+    assert engine.outcome is None
+
+
+def test_colliding_robots_leave_scrap_that_wrecks_later_robots(engine):
+    engine.robot_ai = robot_core_ext.GREEDY
+    engine.load_map(make_map([
+        "RR.",
+        "R..",
+        "..P",
+    ]))
+
+    engine.apply('move', 2, 2)
+    assert engine.robots == {0: (0, 1)}
+    assert engine.map[1, 1] == ord('S')
+    assert engine.hazards[1, 1] == HAZARD_SCRAP
+
+    engine.apply('move', 2, 2)
+    assert engine.robots == {}
+    assert engine.outcome is None
+
+
+def test_scrap_uses_the_configured_cell_code(engine):
+    engine.robot_ai = robot_core_ext.GREEDY
+    engine.scrap_code = ord('Z')
+    engine.load_map(make_map([
+        "RR.",
+        "R..",
+        "..P",
+    ]))
+
+    engine.apply('move', 2, 2)
+    assert engine.map[1, 1] == ord('Z')
+    assert engine.hazards[1, 1] == HAZARD_SCRAP
+
+
+def test_generated_map_uses_the_configured_textures(tmp_path):
+    with open('textures.json') as f:
+        textures = json.load(f)
+    textures.update(cleft='#', robot='X', charge='+', key='*', player='@')
+    path = tmp_path / 'textures.json'
+    path.write_text(json.dumps(textures))
+    engine = GameEngine(GameConfig(difficulty='normal', textures_path=str(path)))
+
+    assert engine.robots and engine.keys and engine.charges
+    assert engine.map[engine.player.position()] == ord('@')
+    assert all(engine.map[cell] == ord('X') for cell in engine.robots.values())
+    assert np.array_equal(engine.hazards == HAZARD_CLEFT, engine.map == ord('#'))
+
+
+def test_robots_converging_on_player_catch_player(engine):
+    engine.load_map(make_map([
+        ".R.",
+        "R..",
+        "...",
+    ]))
+    engine.player.x, engine.player.y = 1, 1
+
+    engine.apply('move', 1, 1)
+    assert engine.outcome == 'robot'
+    assert engine.map[1, 1] != ord('S')
+
+
+def test_ping_kills_robot_on_next_move(engine):
+    engine.load_map(make_map([
+        "PR..",
+    ]))
+    charges = engine.player.charges
+
+    assert engine.apply('ping', 0, 1) is True
+    assert engine.pinged == {0} and engine.player.charges == charges - 1
+    assert engine.apply('ping', 0, 1) is True
+    assert not engine.pinged and engine.player.charges == charges
+
+    engine.apply('ping', 0, 1)
+    engine.apply('move', 0, 1)
+    assert engine.robots == {}
+    assert engine.outcome is None
+
+
+def test_occupancy_index_tracks_robots(engine):
+    engine.reset(seed=11)
+    policy = lambda e: ('move', e.player.x, e.player.y)
+
+    for _ in range(5):
+        if engine.outcome is not None:
+            break
+        engine.apply(*policy(engine))
+        assert engine.robot_cells == {position: robot_id for robot_id, position in engine.robots.items()}
+        for robot_id, (x, y) in engine.robots.items():
+            assert engine.robot_at(x, y) == robot_id
+
+
+def test_stepping_into_cleft_loses(engine):
+    engine.load_map(make_map([
+        "PC",
+    ]))
+
+    engine.apply('move', 0, 1)
+    assert engine.outcome == 'cleft'
+
+
+def test_hazard_mask_marks_clefts_and_scrap(engine):
+    engine.load_map(make_map([
+        "PC.",
+        ".S.",
+    ]))
+
+    assert engine.hazards.tolist() == [[0, HAZARD_CLEFT, 0], [0, HAZARD_SCRAP, 0]]
+
+
+def test_play_until_win(engine):
+    engine.load_map(make_map([
+        "EKKKP",
+    ]))
+    engine.exit_pos = (0, 0)
+
+    outcome = engine.play(lambda e: ('move', e.player.x, e.player.y - 1))
+
+    assert outcome == 'win'
+    assert engine.turn == 3
+
+
+def test_play_rejects_illegal_action(engine):
+    engine.load_map(make_map([
+        "P...",
+    ]))
+
+    with pytest.raises(ValueError):
+        engine.play(lambda e: ('move', 0, 3))
+
+
+def test_pathfinding_robots_route_around_clefts(engine):
+    engine.robot_ai = robot_core_ext.PATHFINDING
+    engine.load_map(make_map([
+        "R.C...",
+        "..C...",
+        ".....P",
+    ]))
+
+    engine.apply('move', 2, 5)
+    assert engine.robots == {0: (0, 1)}
+
+    engine.apply('move', 2, 5)
+    assert engine.robots == {0: (1, 1)}
+
+    engine.apply('move', 2, 5)
+    assert engine.robots == {0: (2, 1)}
+
+
+def test_greedy_robots_walk_into_clefts(engine):
+    engine.robot_ai = robot_core_ext.GREEDY
+    engine.load_map(make_map([
+        ".RC..P",
+    ]))
+
+    engine.apply('move', 0, 5)
+    assert engine.robots == {}
+
+
+def test_distance_field_skips_clefts_and_scrap(engine):
+    engine.load_map(make_map([
+        "..C.",
+        "S.C.",
+        "....",
+    ]))
+    distances = robot_core_ext.distance_field(0, 3, engine.hazards)
+
+    assert distances[0, 3] == 0
+    assert distances[0, 0] == 7
+    assert distances[0, 2] == robot_core_ext.UNREACHABLE
+    assert distances[1, 0] == robot_core_ext.UNREACHABLE
+
+
+def test_clone_is_independent(engine):
+    engine.load_map(make_map([
+        ".......R",
+        ".P......",
+        "........",
+    ]))
+    robots, game_map, position = dict(engine.robots), engine.map.copy(), engine.player.position()
+    clone = engine.clone()
+    clone.apply('move', *clone.get_movable_cells()[0])
+
+    assert engine.turn == 0 and clone.turn == 1
+    assert engine.robots == robots and engine.player.position() == position
+    assert np.array_equal(engine.map, game_map)
+
+
+def test_state_round_trips_through_restore(engine):
+    state = engine.state()
+    engine.apply('move', *engine.get_movable_cells()[0])
+
+    engine.restore(state)
+
+    assert engine.turn == 0
+    assert engine.player.position() == state['player'][:2]
+    assert engine.robot_cells == {position: robot_id for robot_id, position in state['robots'].items()}
@@ -33,3 +33,45 @@ def test_play_background_music(mock_play, mock_load):
     game.play_background_music()
     mock_load.assert_called_with("assets/sounds/background_music.mp3")
     mock_play.assert_called_with(loops=-1)
+
+
+@patch('start_menu.StartMenu.run', return_value='normal')
+def test_reset_keeps_window_and_rebuilds_entities(mock_menu_run):
+    game = Game()
+    screen, renderer, engine = game.screen, game.renderer, game.engine
+    seed = game.engine.seed
+
+    with patch('pygame.display.set_mode') as mock_set_mode:
+        game.reset()
+
+    mock_set_mode.assert_not_called()
+    assert game.screen is screen and game.renderer is renderer and game.engine is engine
+    assert game.engine.seed != seed
+    assert len(game.robots) == len(game.engine.robots)
+    assert len(game.keys) == len(game.engine.keys)
+    assert game.engine.outcome is None
+    mock_menu_run.assert_called_once()
+
+
+@patch('start_menu.StartMenu.run', return_value='normal')
+def test_reset_with_new_difficulty(mock_menu_run):
+    game = Game()
+
+    game.reset(difficulty='hard')
+
+    assert game.difficulty == 'hard'
+    assert game.player.max_charges == game.game_config.get_difficulty_settings()['max_charges']
+
+
+def test_autosave_resumes_interrupted_game(tmp_path, monkeypatch):
+    monkeypatch.setenv('ROBOTBATTLE_AUTOSAVE', str(tmp_path / 'autosave.rbs'))
+    game = Game(difficulty='normal')
+    game.engine.reset(seed=3)
+    game.engine.apply('move', *game.engine.get_movable_cells()[0])
+    game.autosave()
+
+    resumed = Game(difficulty='normal')
+
+    assert (resumed.engine.seed, resumed.engine.turn) == (game.engine.seed, 1)
+    assert resumed.player.position() == game.player.position()
+    assert set(resumed.robot_sprites) == set(game.engine.robots)
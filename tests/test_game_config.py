@@ -0,0 +1,78 @@
+import json
+import os
+import pickle
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+
+import robot_core_ext
+
+from game_config import GameConfig
+
+
+def test_derived_values_are_precomputed():
+    config = GameConfig(difficulty='normal')
+
+    assert config.screen_size == (config.viewport_cols * config.cell_size, config.viewport_rows * config.cell_size)
+    assert config.key_coefficient == config.number_of_keys / (config.rows * config.cols)
+    assert config.cell_codes['cleft'] == ord('C') and ord('R') in config.object_codes
+    assert config.robot_ai == robot_core_ext.PATHFINDING
+    assert config.cfg_data.rows == config.rows and config.cfg_data.exit_pos == config.exit_position
+
+
+def test_config_is_immutable():
+    config = GameConfig(difficulty='normal')
+
+    with pytest.raises(AttributeError):
+        config.rows = 5
+    with pytest.raises(TypeError):
+        config.get_grid_settings()['rows'] = 5
+
+
+def test_replace_recompiles_overrides():
+    config = GameConfig(difficulty='normal')
+
+    replaced = config.replace(grid={'rows': 40}, difficulty_settings={'max_charges': 1})
+
+    assert (replaced.rows, replaced.max_charges, replaced.cols) == (40, 1, config.cols)
+    assert replaced.cfg_data.rows == 40 and config.rows == 11
+
+
+def test_load_reuses_compiled_config():
+    assert GameConfig.load('hard') is GameConfig.load('hard')
+    assert GameConfig.load('hard') is not GameConfig.load('easy')
+
+
+def test_config_pickles_for_worker_processes():
+    config = GameConfig(difficulty='easy').replace(difficulty_settings={'max_charges': 2})
+
+    restored = pickle.loads(pickle.dumps(config))
+
+    assert restored.max_charges == 2 and restored.cfg_data.rows == config.rows
+
+
+@pytest.mark.parametrize('section, overrides', [
+    ('difficulty_settings', {'robot_ai': 'psychic'}),
+    ('difficulty_settings', {'clefts_coefficient': 1.5}),
+    ('grid', {'cell_size': 0}),
+    ('gameplay', {'exit_position': [99, 0]}),
+    ('display', {'max_fps': 0}),
+    ('display', {'max_fps': -30}),
+])
+def test_bad_settings_are_rejected(section, overrides):
+    with pytest.raises(ValueError):
+        GameConfig(difficulty='easy').replace(**{section: overrides})
+
+
+def test_bad_config_file_fails_at_startup(tmp_path):
+    with open('config.json') as f:
+        config = json.load(f)
+    del config['gameplay']['number_of_keys']
+    path = tmp_path / 'config.json'
+    path.write_text(json.dumps(config))
+
+    with pytest.raises(ValueError):
+        GameConfig(difficulty='easy', config_path=str(path))
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pygame
+
+import game_over_screen_ext
+
+
+def test_blur_keeps_uniform_image():
+    image = np.full((40, 30, 3), 123, dtype=np.uint8)
+    game_over_screen_ext.apply_gaussian_blur(image, sigma=2)
+    assert (image == 123).all()
+
+
+def test_blur_runs_in_both_directions_in_place():
+    image = np.zeros((41, 41, 3), dtype=np.uint8)
+    image[20, 20] = 255
+
+    game_over_screen_ext.apply_gaussian_blur(image, sigma=2, threads=4)
+
+    assert image[20, 20, 0] < 255
+    assert image[20, 22, 0] > 0 and image[22, 20, 0] > 0
+    assert np.array_equal(image[20, :, 0], image[:, 20, 0])
+
+
+def test_blur_matches_between_thread_counts():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(64, 48, 3), dtype=np.uint8)
+    single, threaded = image.copy(), image.copy()
+
+    game_over_screen_ext.apply_gaussian_blur(single, sigma=2, threads=1)
+    game_over_screen_ext.apply_gaussian_blur(threaded, sigma=2, threads=3)
+
+    assert np.array_equal(single, threaded)
+
+
+def test_blur_works_on_surface_pixels():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    surface = pygame.Surface((32, 16)).convert()
+    surface.fill((0, 0, 0))
+    surface.fill((255, 255, 255), pygame.Rect(16, 0, 16, 16))
+
+    pixels = pygame.surfarray.pixels3d(surface)
+    game_over_screen_ext.apply_gaussian_blur(pixels, sigma=2)
+    del pixels
+
+    assert 0 < surface.get_at((15, 8)).r < 255
+    pygame.quit()
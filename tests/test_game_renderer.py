@@ -0,0 +1,143 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pygame
+import pytest
+
+from engine import PlayerState
+from game_config import GameConfig
+from game_renderer import GameRenderer
+from utils import load_sprite, load_sprite_sheet
+
+
+@pytest.fixture
+def renderer():
+    pygame.init()
+    config = GameConfig(difficulty='normal')
+    grid = config.get_grid_settings()
+    cell_size = grid["cell_size"]
+    screen = pygame.display.set_mode((grid["cols"] * cell_size, grid["rows"] * cell_size))
+    sprite = load_sprite('assets/robot1.png', cell_size)
+    renderer = GameRenderer(
+        screen,
+        load_sprite_sheet('assets/tiles.png', cell_size, cell_size),
+        sprite, sprite, sprite, sprite,
+        config
+    )
+    yield renderer
+    pygame.quit()
+
+
+def make_scene(renderer):
+    game_map = np.full((renderer.rows, renderer.cols), 7, dtype=np.uint8)
+    player = PlayerState(5, 10, 5)
+    return game_map, {(2, 3)}, set(), player, {(5, 14): 0}, set(), [(5, 9), (5, 11)]
+
+
+def test_unchanged_frame_pushes_nothing(renderer, mocker):
+    scene = make_scene(renderer)
+    renderer.render(*scene)
+
+    update = mocker.patch('pygame.display.update')
+    flip = mocker.patch('pygame.display.flip')
+    renderer.render(*scene)
+
+    update.assert_not_called()
+    flip.assert_not_called()
+
+
+def test_only_changed_cells_are_pushed(renderer, mocker):
+    game_map, keys, charges, player, robot_cells, pinged, highlight = scene = make_scene(renderer)
+    renderer.render(*scene)
+
+    update = mocker.patch('pygame.display.update')
+    robot_cells[(5, 13)] = robot_cells.pop((5, 14))
+    renderer.render(*scene)
+
+    rects = update.call_args.args[0]
+    assert sorted(rects) == sorted([renderer.cell_rect(5, 13), renderer.cell_rect(5, 14)])
+
+
+def test_incremental_frame_matches_full_redraw(renderer):
+    game_map, keys, charges, player, robot_cells, pinged, highlight = make_scene(renderer)
+    renderer.render(game_map, keys, charges, player, robot_cells, pinged, highlight)
+
+    player.y, player.charges = 9, 4
+    pinged.add(0)
+    keys.clear()
+    game_map[5, 12] = ord('S')
+    renderer.render(game_map, keys, charges, player, robot_cells, pinged, [(5, 8)])
+    incremental = pygame.image.tobytes(renderer.screen, 'RGB')
+
+    renderer.invalidate()
+    renderer.render(game_map, keys, charges, player, robot_cells, pinged, [(5, 8)])
+    assert pygame.image.tobytes(renderer.screen, 'RGB') == incremental
+
+
+def test_pinged_robot_uses_cached_overlay(renderer, mocker):
+    game_map, keys, charges, player, robot_cells, pinged, highlight = make_scene(renderer)
+    pinged.add(0)
+    ellipse = mocker.patch('pygame.draw.ellipse')
+
+    renderer.render(game_map, keys, charges, player, robot_cells, pinged, highlight)
+
+    ellipse.assert_not_called()
+    rect = renderer.cell_rect(5, 14)
+    expected = renderer.screen.subsurface(rect).copy()
+    expected.blit(renderer.tiles[7], (0, 0))
+    expected.blit(renderer.robot_sprite, (0, 0))
+    mocker.stopall()
+    pygame.draw.ellipse(expected, (0, 255, 255), expected.get_rect().inflate(-10, -10), width=2)
+    assert pygame.image.tobytes(renderer.screen.subsurface(rect), 'RGB') == pygame.image.tobytes(expected, 'RGB')
+
+
+@pytest.fixture
+def large_renderer():
+    pygame.init()
+    config = GameConfig(difficulty='normal').replace(grid={'rows': 200, 'cols': 200})
+    cell_size = config.cell_size
+    screen = pygame.display.set_mode((18 * cell_size, 11 * cell_size))
+    sprite = load_sprite('assets/robot1.png', cell_size)
+    renderer = GameRenderer(
+        screen,
+        load_sprite_sheet('assets/tiles.png', cell_size, cell_size),
+        sprite, sprite, sprite, sprite,
+        config
+    )
+    yield renderer
+    pygame.quit()
+
+
+def test_large_map_only_bakes_visible_chunks(large_renderer):
+    renderer = large_renderer
+    game_map = np.full((200, 200), 7, dtype=np.uint8)
+    player = PlayerState(100, 100, 5)
+    robot_cells = {(x, y): x * 200 + y for x in range(0, 200, 4) for y in range(0, 200, 4)}
+
+    renderer.render(game_map, set(), set(), player, robot_cells, set(), [])
+
+    assert renderer.camera.contains(100, 100)
+    assert len(renderer.chunks) == len(renderer.visible_chunks()) <= 4
+    assert all(renderer.camera.contains(*cell) for cell in renderer.cell_contents)
+
+
+def test_camera_scroll_matches_fresh_render(large_renderer):
+    renderer = large_renderer
+    game_map = np.full((200, 200), 7, dtype=np.uint8)
+    game_map[100, 130] = ord('S')
+    player = PlayerState(100, 100, 5)
+    scene = [game_map, set(), set(), player, {(101, 131): 0}, set(), []]
+    renderer.render(*scene)
+
+    player.y = 125
+    renderer.render(*scene)
+    scrolled = pygame.image.tobytes(renderer.screen, 'RGB')
+
+    renderer.invalidate()
+    renderer.render(*scene)
+    assert renderer.camera.contains(101, 131)
+    assert pygame.image.tobytes(renderer.screen, 'RGB') == scrolled
@@ -3,6 +3,9 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
 
+import numpy as np
+import pytest
+
 import map_generator_ext
 
 
@@ -26,18 +29,122 @@ def test_generate_map():
 
     game_map = map_generator_ext.generate_map(config)
 
-    assert len(game_map) == config.rows, "Invalid rows count"
-    assert len(game_map[0]) == config.cols, "Invalid columns count"
+    assert game_map.shape == (config.rows, config.cols), "Invalid map shape"
+    assert game_map.dtype == np.uint8, "Map must be a uint8 grid"
+    assert game_map.flags.c_contiguous, "Map must be C-contiguous"
 
     for row in game_map:
-        print(" ".join(row))
+        print(" ".join(chr(cell) if cell >= ord('A') else str(cell) for cell in row))
+
+    assert game_map[config.player_pos] == ord('P'), "No player on map"
+    assert game_map[config.exit_pos] == ord('E'), "No exit on map"
+
+
+def make_config():
+    config = map_generator_ext.ConfigData()
+    config.rows = 12
+    config.cols = 16
+    config.default_textures = [0, 1, 2]
+    config.player_pos = (6, 15)
+    config.exit_pos = (6, 0)
+    config.clefts_coeff = 0.15
+    config.initial_robots_coeff = 0.1
+    config.charges_coeff = 0.05
+    config.key_coefficient = 3 / config.rows / config.cols
+    config.cleft_char = 'C'
+    config.robot_char = 'R'
+    config.charge_char = 'G'
+    config.key_char = 'K'
+    config.player_char = 'P'
+    config.exit_char = 'E'
+    return config
+
+
+def test_seed_makes_map_reproducible():
+    config = make_config()
+
+    first = map_generator_ext.generate_map(config, 1234)
+    second = map_generator_ext.generate_map(config, 1234)
+    other = map_generator_ext.generate_map(config, 4321)
+
+    assert np.array_equal(first, second)
+    assert not np.array_equal(first, other)
+
+
+def test_generate_maps_matches_single_generation():
+    config = make_config()
+    seeds = [3, 1, 4, 1, 5, 9, 2, 6]
+
+    game_maps = map_generator_ext.generate_maps(config, seeds, threads=3)
+
+    assert game_maps.shape == (len(seeds), config.rows, config.cols)
+    assert game_maps.flags.c_contiguous
+    for seed, game_map in zip(seeds, game_maps):
+        assert np.array_equal(map_generator_ext.generate_map(config, seed), game_map)
+
 
-    assert any('P' in row for row in game_map), "No player on map"
-    assert any('E' in row for row in game_map), "No exit on map"
+def reachable(game_map, start):
+    rows, cols = game_map.shape
+    seen = {start}
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < rows and 0 <= ny < cols and (nx, ny) not in seen and game_map[nx, ny] != ord('C'):
+                    seen.add((nx, ny))
+                    stack.append((nx, ny))
+    return seen
+
+
+def test_generated_maps_are_solvable():
+    config = make_config()
+    config.clefts_coeff = 0.55
+
+    for game_map in map_generator_ext.generate_maps(config, list(range(200))):
+        cells = reachable(game_map, config.player_pos)
+        keys = {tuple(pos) for pos in np.argwhere(game_map == ord('K')).tolist()}
+        assert config.exit_pos in cells
+        assert keys <= cells
+        assert map_generator_ext.is_solvable(config, game_map)
+
+
+def test_is_solvable_detects_walled_off_exit():
+    config = make_config()
+    game_map = np.ones((config.rows, config.cols), dtype=np.uint8)
+    game_map[config.player_pos] = ord('P')
+    game_map[config.exit_pos] = ord('E')
+    assert map_generator_ext.is_solvable(config, game_map)
+
+    game_map[:, 1] = ord('C')
+    assert not map_generator_ext.is_solvable(config, game_map)
 
 
 def count_objects(game_map, obj_char):
-    return sum(row.count(obj_char) for row in game_map)
+    return int(np.count_nonzero(game_map == ord(obj_char)))
+
+
+def test_texture_colliding_with_object_code_is_rejected():
+    config = map_generator_ext.ConfigData()
+    config.rows = 5
+    config.cols = 5
+    config.default_textures = [ord('C')]
+    config.player_pos = (0, 0)
+    config.exit_pos = (4, 4)
+    config.clefts_coeff = 0.1
+    config.initial_robots_coeff = 0.05
+    config.charges_coeff = 0.03
+    config.key_coefficient = 0.02
+    config.cleft_char = 'C'
+    config.robot_char = 'R'
+    config.charge_char = 'G'
+    config.key_char = 'K'
+    config.player_char = 'P'
+    config.exit_char = 'E'
+
+    with pytest.raises(ValueError):
+        map_generator_ext.generate_map(config)
 
 
 def test_object_quantities():
@@ -0,0 +1,101 @@
+import json
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+import pytest
+
+from profiler import PhaseProfiler, StartupTimer, create_profiler, percentile
+
+
+def test_disabled_profiler_leaves_functions_untouched():
+    profiler = PhaseProfiler()
+
+    def render():
+        pass
+
+    assert profiler.wrap(render, 'render') is render
+    assert not profiler.samples
+
+
+def test_wrapped_phase_records_samples():
+    profiler = PhaseProfiler(enabled=True, window=3)
+    render = profiler.wrap(lambda value: value * 2, 'render')
+
+    for value in range(5):
+        assert render(value) == value * 2
+
+    assert len(profiler.samples['render']) == 3
+    assert profiler.percentiles()['render']['count'] == 3
+
+
+def test_instrument_module_wraps_extension_functions_once():
+    profiler = PhaseProfiler(enabled=True)
+    module = types.ModuleType('fake_ext')
+    module.length = len
+
+    profiler.instrument_module(module)
+    wrapped = module.length
+    profiler.instrument_module(module)
+
+    assert module.length is wrapped
+    assert module.length([1, 2]) == 2
+    assert len(profiler.samples['fake_ext.length']) == 1
+
+
+def test_percentile_of_sorted_samples():
+    samples = list(range(1, 101))
+
+    assert percentile(samples, 50) == 51
+    assert percentile(samples, 99) == 99
+    assert percentile([4.0], 95) == 4.0
+
+
+def test_dump_writes_percentiles(tmp_path):
+    profiler = PhaseProfiler(enabled=True)
+    profiler.record('render', 2.0)
+    path = tmp_path / 'profile.json'
+
+    profiler.dump(str(path))
+
+    assert json.loads(path.read_text())['render']['p50'] == 2.0
+
+
+def test_environment_variable_enables_profiler(monkeypatch):
+    monkeypatch.delenv('ROBOTBATTLE_PROFILE', raising=False)
+    assert not create_profiler().enabled
+
+    monkeypatch.setenv('ROBOTBATTLE_PROFILE', '1')
+    assert create_profiler().enabled
+
+
+def test_overlay_lists_every_phase():
+    pygame.init()
+    profiler = PhaseProfiler(enabled=True)
+    profiler.record('render', 1.0)
+    profiler.record('handle_events', 0.5)
+    surface = pygame.Surface((864, 528))
+    font = pygame.font.Font(os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf'), 8)
+
+    rect = profiler.draw_overlay(surface, font)
+
+    assert surface.get_rect().contains(rect)
+    assert rect.height >= 3 * font.get_linesize()
+    pygame.quit()
+
+
+def test_startup_report_excludes_idle_phases(mocker):
+    clock = mocker.patch('time.perf_counter', side_effect=[0.0, 0.010, 2.010, 2.040])
+    timer = StartupTimer(enabled=True)
+
+    timer.mark('start menu')
+    timer.mark('difficulty selection', idle=True)
+    timer.mark('first frame')
+
+    assert clock.call_count == 4
+    assert timer.total() == pytest.approx(40.0)
+    assert 'not counted' in timer.report().splitlines()[1]
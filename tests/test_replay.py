@@ -0,0 +1,85 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from bot import MCTSBot
+from engine import GameEngine
+from game_config import GameConfig
+from play_replay import ReplayPlayer, check, simulate
+from replay import ACTION, HEADER, Replay
+
+
+@pytest.fixture
+def recorded():
+    engine = GameEngine(GameConfig(difficulty='easy'), seed=4)
+    engine.play(MCTSBot(iterations=20, seed=4), max_turns=15)
+    return engine
+
+
+def test_actions_take_five_bytes_each(recorded):
+    data = recorded.replay().to_bytes()
+
+    assert len(data) == HEADER.size + len('easy') + ACTION.size * len(recorded.recorder)
+
+
+def test_replay_round_trips_through_bytes(recorded):
+    replay = recorded.replay()
+
+    loaded = Replay.from_bytes(replay.to_bytes())
+
+    assert (loaded.difficulty, loaded.seed, loaded.outcome, loaded.turns) == ('easy', recorded.seed,
+                                                                              recorded.outcome, recorded.turn)
+    assert loaded.actions == replay.actions
+
+
+def test_simulation_reproduces_the_game(recorded):
+    engine = simulate(recorded.replay())
+
+    assert (engine.outcome, engine.turn) == (recorded.outcome, recorded.turn)
+    assert engine.player.position() == recorded.player.position()
+    assert np.array_equal(engine.map, recorded.map)
+
+
+def test_simulation_jumps_to_turn(recorded):
+    engine = simulate(recorded.replay(), turn=2)
+
+    assert engine.turn == min(2, recorded.turn)
+    assert engine.outcome is None or recorded.turn <= 2
+
+
+def test_replay_player_feeds_recorded_actions(recorded):
+    replay = recorded.replay()
+    engine = GameEngine(GameConfig(difficulty='easy'))
+    engine.reset(replay.seed)
+
+    outcome = engine.play(ReplayPlayer(replay), max_turns=replay.turns)
+
+    assert (outcome, engine.turn) == (replay.outcome, replay.turns)
+
+
+def test_check_flags_replays_that_no_longer_match(recorded, tmp_path):
+    good = tmp_path / 'good.rbr'
+    bad = tmp_path / 'bad.rbr'
+    replay = recorded.replay()
+    replay.save(str(good))
+    replay.turns += 1
+    replay.save(str(bad))
+
+    assert check([str(good)]) == []
+    assert len(check([str(good), str(bad)])) == 1
+
+
+def test_corrupt_data_is_rejected(recorded):
+    data = recorded.replay().to_bytes()
+
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data + b'\x00')
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:HEADER.size - 1])
@@ -0,0 +1,41 @@
+import pygame
+
+from scheduler import FrameScheduler
+
+
+def test_idle_wait_blocks_without_timeout(mocker):
+    click = pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"pos": (0, 0), "button": 1})
+    wait = mocker.patch('pygame.event.wait', return_value=click)
+    mocker.patch('pygame.event.get', return_value=[])
+
+    events = FrameScheduler().wait()
+
+    wait.assert_called_once_with()
+    assert events == [click]
+
+
+def test_animation_waits_until_next_frame(mocker):
+    pygame.init()
+    wait = mocker.patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT))
+    mocker.patch('pygame.event.get', return_value=[])
+    scheduler = FrameScheduler(max_fps=20)
+    scheduler.next_frame = pygame.time.get_ticks() + 50
+
+    events = scheduler.wait(animating=True)
+
+    timeout = wait.call_args.args[0]
+    assert 0 < timeout <= 50
+    assert events == []
+
+
+def test_frame_cap_applies_without_power_save(mocker):
+    pygame.init()
+    mocker.patch('pygame.event.wait', return_value=pygame.event.Event(pygame.NOEVENT))
+    mocker.patch('pygame.event.poll', return_value=pygame.event.Event(pygame.NOEVENT))
+    mocker.patch('pygame.event.get', return_value=[])
+    scheduler = FrameScheduler(max_fps=10, power_save=False)
+
+    scheduler.wait()
+    assert scheduler.frame_due is True
+    scheduler.wait()
+    assert scheduler.frame_due is False
@@ -0,0 +1,83 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+
+from engine import GameEngine
+from game_config import GameConfig
+from snapshot import HEADER, Snapshot, save
+
+
+@pytest.fixture
+def engine():
+    engine = GameEngine(GameConfig(difficulty='normal'), seed=11)
+    engine.apply('move', *engine.get_movable_cells()[0])
+    engine.pinged.add(next(iter(engine.robots)))
+    engine.player.charges -= 1
+    return engine
+
+
+def assert_same_state(engine, other):
+    state, other_state = engine.state(), other.state()
+    assert np.array_equal(state.pop('map'), other_state.pop('map'))
+    assert state == other_state
+    assert engine.rng.getstate() == other.rng.getstate()
+
+
+def test_snapshot_round_trips_engine_state(engine):
+    restored = GameEngine(GameConfig(difficulty='normal'))
+
+    restored.load_snapshot(Snapshot.from_buffer(engine.snapshot()))
+
+    assert_same_state(engine, restored)
+    assert restored.robot_cells == engine.robot_cells
+
+
+def test_snapshot_map_is_a_view_of_the_buffer(engine):
+    data = engine.snapshot()
+
+    game_map = Snapshot.from_buffer(data).state['map']
+
+    assert not game_map.flags.owndata
+    assert game_map.shape == engine.map.shape
+
+
+def test_saved_snapshot_loads_through_mmap(engine, tmp_path):
+    path = str(tmp_path / 'game.rbs')
+    save(engine.snapshot(), path)
+    restored = GameEngine(GameConfig(difficulty='normal'))
+
+    restored.load_snapshot(Snapshot.load(path))
+
+    assert_same_state(engine, restored)
+    assert os.listdir(tmp_path) == ['game.rbs']
+
+
+def test_snapshot_branches_simulation(engine):
+    data = engine.snapshot()
+    branch = GameEngine(GameConfig(difficulty='normal'))
+    branch.load_snapshot(Snapshot.from_buffer(data))
+
+    for game in (engine, branch):
+        game.apply('move', *game.get_movable_cells()[-1])
+
+    assert_same_state(engine, branch)
+
+
+def test_snapshot_rejects_other_difficulty(engine):
+    snapshot = Snapshot.from_buffer(engine.snapshot())
+
+    with pytest.raises(ValueError):
+        GameEngine(GameConfig(difficulty='easy')).load_snapshot(snapshot)
+
+
+def test_corrupt_snapshot_is_rejected(engine):
+    data = engine.snapshot()
+
+    for corrupt in (b'XXXX' + data[4:], data[:-1], data[:HEADER.size - 1]):
+        with pytest.raises(ValueError):
+            Snapshot.from_buffer(corrupt)
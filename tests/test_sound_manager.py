@@ -3,9 +3,17 @@ from unittest.mock import Mock
 
 import pytest
 
+from assets import asset_cache
 from sound_manager import SoundManager
 
 
+@pytest.fixture(autouse=True)
+def clear_asset_cache():
+    asset_cache.clear()
+    yield
+    asset_cache.clear()
+
+
 def test_load_sound_success(mocker):
     mock_sound = mocker.patch("pygame.mixer.Sound")
     mock_sound.return_value = Mock()
@@ -14,7 +22,7 @@ def test_load_sound_success(mocker):
     sound = manager.load_sound("assets/sounds/click3.wav")
 
     assert sound is not None
-    mock_sound.assert_called_with("assets/sounds/click3.wav")
+    mock_sound.assert_any_call("assets/sounds/click3.wav")
 
 
 def test_load_sound_failure(mocker):
@@ -38,7 +46,23 @@ def test_sounds_initialization(mocker):
     assert "collect_charge" in manager.sounds
     assert "game_over" in manager.sounds
 
-    assert mock_sound.call_count == len(manager.sounds)
+    assert mock_sound.call_count == len({
+        "assets/sounds/click3.wav",
+        "assets/sounds/move.wav",
+        "assets/sounds/collect_item.wav",
+        "assets/sounds/game_over.wav",
+    })
+
+
+def test_sounds_are_decoded_once_per_process(mocker):
+    mock_sound = mocker.patch("pygame.mixer.Sound")
+
+    first = SoundManager()
+    calls = mock_sound.call_count
+    second = SoundManager()
+
+    assert mock_sound.call_count == calls
+    assert first.sounds["move"] is second.sounds["move"]
 
 
 def test_play_sound_success(mocker):
@@ -67,3 +91,14 @@ def test_mixer_init_failure(mocker):
 
     with pytest.raises(pygame.error):
         SoundManager()
+
+
+def test_deferred_sounds_load_on_first_play(mocker):
+    mock_sound = mocker.patch("pygame.mixer.Sound")
+
+    manager = SoundManager(preload=('click',))
+    assert set(manager.sounds) == {'click'}
+
+    manager.play('move')
+    mock_sound.assert_called_with("assets/sounds/move.wav")
+    assert set(manager.sounds) == {'click', 'move'}
@@ -0,0 +1,61 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../ext")))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+import pytest
+
+from text_cache import TextCache, GlyphAtlas
+
+FONT_PATH = os.path.join('assets', 'fonts', 'PressStart2P-Regular.ttf')
+
+
+@pytest.fixture
+def font():
+    pygame.init()
+    yield pygame.font.Font(FONT_PATH, 20)
+    pygame.quit()
+
+
+def test_repeated_text_is_rendered_once(font, mocker):
+    cache = TextCache()
+    counting_font = mocker.Mock(wraps=font)
+
+    first = cache.render(counting_font, 'GAME OVER', (255, 255, 255), (0, 0, 0))
+    second = cache.render(counting_font, 'GAME OVER', (255, 255, 255), (0, 0, 0))
+
+    assert first is second
+    assert counting_font.render.call_count == 2
+
+
+def test_least_recently_used_entry_is_evicted(font):
+    cache = TextCache(max_entries=2)
+    first = cache.render(font, 'a', (255, 255, 255))
+    cache.render(font, 'b', (255, 255, 255))
+    cache.render(font, 'a', (255, 255, 255))
+    cache.render(font, 'c', (255, 255, 255))
+
+    assert len(cache) == 2
+    assert cache.render(font, 'a', (255, 255, 255)) is first
+
+
+def test_cache_is_cleared_on_quit(font):
+    cache = TextCache()
+    cache.render(font, 'a', (255, 255, 255))
+    pygame.quit()
+
+    assert len(cache) == 0
+
+
+def test_glyph_atlas_matches_font_rendering(font):
+    atlas = GlyphAtlas(font, (255, 255, 255))
+    surface = pygame.Surface((200, 40))
+
+    rect = atlas.draw(surface, 'x42', (0, 0))
+
+    assert rect.size == (font.size('x42')[0], font.get_height())
+    expected = pygame.Surface((200, 40))
+    expected.blit(font.render('x42', True, (255, 255, 255)), (0, 0))
+    assert pygame.image.tobytes(surface, 'RGB') == pygame.image.tobytes(expected, 'RGB')
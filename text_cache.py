@@ -0,0 +1,84 @@
+from collections import OrderedDict
+
+import pygame
+
+Color = tuple[int, int, int]
+
+STROKE_OFFSETS = [(-2, 0), (2, 0), (0, -2), (0, 2), (-2, -2), (2, -2), (-2, 2), (2, 2)]
+
+
+class TextCache:
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self._quit_registered = False
+
+    def render(self,
+               font: pygame.font.Font,
+               text: str,
+               color: Color,
+               stroke_color: Color | None = None
+               ) -> pygame.Surface:
+        key = (font, text, tuple(color), tuple(stroke_color) if stroke_color else None)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+
+        if stroke_color is None:
+            surface = font.render(text, True, color)
+        else:
+            surface = self._render_stroked(font, text, color, stroke_color)
+
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        if not self._quit_registered:
+            pygame.register_quit(self._on_quit)
+            self._quit_registered = True
+        return surface
+
+    def _render_stroked(self, font: pygame.font.Font, text: str, color: Color, stroke_color: Color) -> pygame.Surface:
+        text_surface = font.render(text, True, color)
+        stroke_surface = font.render(text, True, stroke_color)
+
+        outline_surface = pygame.Surface(text_surface.get_size(), pygame.SRCALPHA)
+        for dx, dy in STROKE_OFFSETS:
+            outline_surface.blit(stroke_surface, (dx + 2, dy + 2))
+        outline_surface.blit(text_surface, (2, 2))
+        return outline_surface
+
+    def _on_quit(self) -> None:
+        self.clear()
+        self._quit_registered = False
+
+    def clear(self) -> None:
+        self._surfaces.clear()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, color: Color, characters: str = '0123456789x'):
+        self.glyphs = {char: font.render(char, True, color) for char in characters}
+        self.height = font.get_height()
+
+    def draw(self, surface: pygame.Surface, text: str, position: tuple[int, int]) -> pygame.Rect:
+        x, y = position
+        surface.blits([(self.glyphs[char], (x + offset, y)) for char, offset in self._layout(text)], doreturn=False)
+        return pygame.Rect(position, (self.width(text), self.height))
+
+    def width(self, text: str) -> int:
+        return sum(self.glyphs[char].get_width() for char in text)
+
+    def _layout(self, text: str) -> list[tuple[str, int]]:
+        layout = []
+        offset = 0
+        for char in text:
+            layout.append((char, offset))
+            offset += self.glyphs[char].get_width()
+        return layout
+
+
+text_cache = TextCache()